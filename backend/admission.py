@@ -0,0 +1,134 @@
+"""
+Admission control for expensive routes.
+
+ConcurrencyLimiter caps how many requests of a route group (bcrypt auth,
+membership writes) run at once. Requests beyond the cap wait in a bounded
+FIFO queue; one that can't get a slot within max_wait, or finds the queue
+full, is shed (503 + Retry-After) instead of adding to a backlog that makes
+every request slow.
+
+RateLimiter is a token bucket per key (client IP, account email) used on the
+auth routes: each key may burst up to `burst` requests and then gets `rate`
+per second (429 + Retry-After beyond that). Keys are kept in a bounded LRU so
+a flood of distinct addresses can't grow memory without limit.
+
+Both are per worker process, like the caches.
+"""
+import asyncio
+import time
+from collections import OrderedDict, deque
+
+
+class Overloaded(Exception):
+    """Raised when a request can't be admitted; `reason` is queue_full or timeout"""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class ConcurrencyLimiter:
+    def __init__(self, name: str, limit: int, max_queue: int, max_wait: float):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.in_flight = 0
+        self.admitted = 0
+        self.shed = {"queue_full": 0, "timeout": 0}
+        self._waiters = deque()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def _expire(self, waiter):
+        if not waiter.done():
+            waiter.set_result(False)
+            self._waiters.remove(waiter)
+
+    def _reject(self, reason: str):
+        self.shed[reason] += 1
+        raise Overloaded(reason)
+
+    async def acquire(self):
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self._reject("queue_full")
+
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._waiters.append(waiter)
+        timer = loop.call_later(self.max_wait, self._expire, waiter)
+        try:
+            granted = await waiter
+        except asyncio.CancelledError:
+            if waiter.cancelled():
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass  # release() already skipped past it
+            elif waiter.result():
+                # A slot was handed over just as the caller went away
+                self.release()
+            raise
+        finally:
+            timer.cancel()
+        if not granted:
+            self._reject("timeout")
+        self.admitted += 1
+
+    def release(self):
+        # Hand the slot straight to the oldest waiter so in_flight never dips
+        # below the limit while others are queued
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(True)
+                return
+        self.in_flight -= 1
+
+    def samples(self):
+        labels = (("group", self.name),)
+        yield "biddge_admission_limit", "gauge", labels, self.limit
+        yield "biddge_admission_in_flight", "gauge", labels, self.in_flight
+        yield "biddge_admission_waiting", "gauge", labels, self.waiting
+        yield "biddge_admission_admitted_total", "counter", labels, self.admitted
+        for reason, count in self.shed.items():
+            yield "biddge_admission_shed_total", "counter", labels + (("reason", reason),), count
+
+
+class RateLimiter:
+    def __init__(self, name: str, rate: float, burst: int, max_keys: int = 100_000):
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self.rejected = 0
+        self._buckets = OrderedDict()  # key -> (tokens, last refill)
+
+    def check(self, key) -> float:
+        """Take a token for key; returns 0 if allowed, else seconds until one is available"""
+        if self.rate <= 0:
+            return 0
+        now = time.monotonic()
+        tokens, last = self._buckets.pop(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - last) * self.rate)
+        if tokens >= 1:
+            tokens -= 1
+            wait = 0
+        else:
+            wait = (1 - tokens) / self.rate
+            self.rejected += 1
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+    def samples(self):
+        labels = (("limiter", self.name),)
+        yield "biddge_rate_limit_rejected_total", "counter", labels, self.rejected
+        yield "biddge_rate_limit_keys", "gauge", labels, len(self._buckets)
@@ -0,0 +1,93 @@
+"""
+Event-loop latency of a cheap endpoint while bcrypt logins run concurrently.
+
+Compares bcrypt called inline on the event loop (the old behaviour) with
+bcrypt run through PasswordPool, by timing GET /api/test requests that are
+issued on a fixed schedule while a burst of password verifications is in
+flight. Latency is measured from each probe's scheduled start, so time spent
+waiting for a blocked loop is counted. No database is needed: the
+verifications are driven directly, the probe endpoint does no I/O.
+
+    cd backend && python benchmarks/auth_event_loop.py --logins 32 --probes 200
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx
+
+import server
+from passwords import PasswordPool, hash_password, verify_password
+
+PROBE_INTERVAL = 0.01
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def inline_verify(password, hashed):
+    # What register/login used to do: block the loop for the whole bcrypt call
+    return verify_password(password, hashed)
+
+
+async def measure(mode, verify, logins, probes):
+    hashed = hash_password("benchmark-password")
+    transport = httpx.ASGITransport(app=server.app)
+    latencies = []
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def probe():
+            begin = time.perf_counter()
+            for i in range(probes):
+                scheduled = begin + i * PROBE_INTERVAL
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await client.get("/api/test")
+                latencies.append((time.perf_counter() - scheduled) * 1000)
+
+        async def login_burst():
+            await asyncio.gather(*(verify("benchmark-password", hashed) for _ in range(logins)))
+
+        start = time.perf_counter()
+        await asyncio.gather(probe(), login_burst())
+        elapsed = time.perf_counter() - start
+
+    return {
+        "mode": mode,
+        "logins": logins,
+        "probes": len(latencies),
+        "elapsed_s": round(elapsed, 3),
+        "probe_p50_ms": round(statistics.median(latencies), 2),
+        "probe_p99_ms": round(percentile(latencies, 99), 2),
+        "probe_max_ms": round(max(latencies), 2),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=32, help="concurrent password verifications")
+    parser.add_argument("--probes", type=int, default=200, help="GET /api/test requests to time")
+    parser.add_argument("--kind", choices=["thread", "process"], default="thread")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    pool = PasswordPool(kind=args.kind, workers=args.workers, max_pending=args.logins)
+    results = [
+        await measure("inline", inline_verify, args.logins, args.probes),
+        await measure(f"pool-{args.kind}", pool.verify, args.logins, args.probes),
+    ]
+    pool.shutdown()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
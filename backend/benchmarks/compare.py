@@ -0,0 +1,58 @@
+"""
+Compare two load_test.py reports route by route.
+
+Prints throughput and p50/p99 changes and exits 1 if any route's p99 got
+worse by more than --threshold percent (or started returning errors).
+
+    python benchmarks/compare.py before.json after.json --threshold 20
+"""
+import argparse
+import json
+import sys
+
+
+def change(before, after):
+    if not before:
+        return float("inf") if after else 0.0
+    return (after - before) / before * 100
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=20.0, help="allowed p99 regression in percent")
+    args = parser.parse_args()
+
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+
+    print(f"{before.get('commit')} -> {after.get('commit')} ({after.get('backend')}, concurrency {after.get('concurrency')})")
+    print(f"{'route':40} {'rps':>18} {'p50 ms':>18} {'p99 ms':>18}")
+    regressions = []
+    for route, new in after["routes"].items():
+        old = before["routes"].get(route)
+        if old is None:
+            print(f"{route:40} {'(new)':>18}")
+            continue
+        p99_change = change(old["p99_ms"], new["p99_ms"])
+        print(
+            f"{route:40} "
+            f"{old['throughput_rps']:>8} {change(old['throughput_rps'], new['throughput_rps']):+7.1f}% "
+            f"{old['p50_ms']:>8} {change(old['p50_ms'], new['p50_ms']):+7.1f}% "
+            f"{old['p99_ms']:>8} {p99_change:+7.1f}%"
+        )
+        if p99_change > args.threshold or new["errors"] > old["errors"]:
+            regressions.append(route)
+
+    if regressions:
+        print(f"❌ Regressed: {', '.join(regressions)}")
+        return 1
+    print("✅ No route regressed beyond the threshold")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+Concurrency check for join/leave.
+
+Fires hundreds of parallel join requests (every user joins the same
+community several times at once), then parallel leaves, through the ASGI app
+and checks that member_count and the membership edges match exactly.
+Runs against MONGO_URL in a scratch database that is dropped afterwards, or
+against the in-memory stand-in with --backend memory.
+
+    cd backend && python benchmarks/join_concurrency.py --users 300 --repeat 3
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx
+
+import server
+from indexes import ensure_indexes
+from load_test import make_client
+
+
+async def fire(client, path, tokens, repeat):
+    requests = [
+        client.post(path, headers={"Authorization": f"Bearer {token}"})
+        for token in tokens
+        for _ in range(repeat)
+    ]
+    start = time.perf_counter()
+    responses = await asyncio.gather(*requests)
+    elapsed = time.perf_counter() - start
+    codes = {}
+    for response in responses:
+        codes[response.status_code] = codes.get(response.status_code, 0) + 1
+    return codes, elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=3, help="concurrent joins per user")
+    parser.add_argument("--db", default="biddge_bench", help="scratch database (dropped afterwards)")
+    parser.add_argument("--backend", choices=["memory", "mongod"], default="mongod")
+    args = parser.parse_args()
+
+    server.client = make_client(args.backend)
+    server.db = server.client[args.db]
+    db = server.db
+    # This checks correctness under contention, so queue every write instead of shedding
+    writes = server.admission_limiters["writes"]
+    writes.max_queue = args.users * args.repeat
+    writes.max_wait = 600
+    community_id = "concurrency-check"
+
+    await ensure_indexes(db)
+    await db.communities.insert_one({
+        "id": community_id, "name": "Concurrency", "description": "", "category": "Test",
+        "creator_id": "bench@biddge.com", "creator_name": "Bench", "member_count": 0,
+        "image_url": None, "created_at": "1970-01-01T00:00:00+00:00"
+    })
+    emails = [f"user{i}@bench.biddge.com" for i in range(args.users)]
+    await db.users.insert_many([
+        {"name": email, "email": email, "password": "", "is_creator": False}
+        for email in emails
+    ])
+    tokens = [server.create_access_token({"sub": email}) for email in emails]
+
+    failures = []
+    try:
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for action, expected in (("join", args.users), ("leave", 0)):
+                codes, elapsed = await fire(client, f"/api/communities/{community_id}/{action}", tokens, args.repeat)
+                community = await db.communities.find_one({"id": community_id})
+                members = await db.memberships.count_documents({"community_id": community_id})
+                distinct = len(await db.memberships.distinct("user_email", {"community_id": community_id}))
+                print(f"{action}: {sum(codes.values())} requests in {elapsed:.2f}s, status codes {codes}")
+                print(f"   member_count={community['member_count']} memberships={members} distinct users={distinct} expected={expected}")
+                if community["member_count"] != expected or members != expected or distinct != expected:
+                    failures.append(action)
+                if codes.get(200) != args.users:
+                    failures.append(f"{action} status codes")
+    finally:
+        await server.client.drop_database(args.db)
+
+    if failures:
+        print(f"❌ Membership counts drifted: {', '.join(failures)}")
+        return 1
+    print("✅ member_count matches membership after concurrent joins and leaves")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
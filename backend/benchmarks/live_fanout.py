@@ -0,0 +1,77 @@
+"""
+Cost of one CountBroadcaster tick as the number of live subscribers grows.
+
+For each --subscribers value, subscribes that many clients (--single-share
+of them following one community, the rest following --follow random
+communities each), adds --changes deltas spread over --communities, and
+times broadcast(). Each subscriber drains its queue after every tick, as a
+connected client would. No database or network is involved: this is the
+per-tick CPU the broadcaster takes from the event loop. Reports JSON.
+
+    cd backend && python benchmarks/live_fanout.py --subscribers 1000,10000
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from live_counts import CountBroadcaster
+
+
+async def run(count, args):
+    rng = random.Random(args.seed)
+    communities = [f"c{i}" for i in range(args.communities)]
+    broadcaster = CountBroadcaster(max_subscribers=count)
+    subscribers = []
+    for n in range(count):
+        if n < count * args.single_share:
+            follow = {rng.choice(communities)}
+        else:
+            follow = set(rng.sample(communities, args.follow))
+        subscribers.append(broadcaster.subscribe(follow))
+
+    samples = []
+    for _ in range(args.ticks):
+        for _ in range(args.changes):
+            broadcaster.add(rng.choice(communities), rng.choice((1, -1)))
+        start = time.perf_counter()
+        broadcaster.broadcast()
+        samples.append((time.perf_counter() - start) * 1000)
+        for subscriber in subscribers:
+            while not subscriber.queue.empty():
+                subscriber.queue.get_nowait()
+
+    return {
+        "events_per_tick": round(broadcaster.delivered / args.ticks, 1),
+        "dropped": broadcaster.dropped,
+        "tick_p50_ms": round(statistics.median(samples), 3),
+        "tick_max_ms": round(max(samples), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subscribers", default="1000,5000,10000", help="comma-separated subscriber counts")
+    parser.add_argument("--communities", type=int, default=2000)
+    parser.add_argument("--changes", type=int, default=500, help="join/leave deltas per tick")
+    parser.add_argument("--single-share", type=float, default=0.8, help="share of subscribers following one community")
+    parser.add_argument("--follow", type=int, default=50, help="communities followed by the others (a listing page)")
+    parser.add_argument("--ticks", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    report = {"communities": args.communities, "changes_per_tick": args.changes, "subscribers": {}}
+    for count in (int(part) for part in args.subscribers.split(",")):
+        report["subscribers"][count] = asyncio.run(run(count, args))
+        print(f"   {count}: {report['subscribers'][count]}", file=sys.stderr)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
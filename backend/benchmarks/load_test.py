@@ -0,0 +1,263 @@
+"""
+Endpoint benchmark and load test for every /api route.
+
+Drives the app in-process through an ASGI client (no sockets), with a pool of
+concurrent workers per route, and reports throughput and p50/p95/p99 latency
+per route as JSON so runs from two commits can be compared with compare.py.
+
+Two database backends:
+  --backend memory   in-memory Motor-compatible stand-in (mongomock-motor),
+                     no mongod or network needed
+  --backend mongod   a real server at MONGO_URL, in a scratch database that is
+                     dropped afterwards
+
+    pip install -r benchmarks/requirements.txt
+    cd backend && python benchmarks/load_test.py --backend memory --concurrency 16 --output before.json
+    python benchmarks/compare.py before.json after.json
+
+The in-memory stand-in has no $text support, so search is driven with
+category/min_members filters there and with a text query on mongod.
+
+ASGITransport only returns a response once the app has finished it, so
+GET /communities/live is timed as open + end of stream: while that route
+runs, every stream is ended as soon as it opens.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx
+
+import server
+from generate_dataset import CATEGORIES, communities, community_id
+from passwords import hash_password
+from reconcile_counts import rebuild_category_stats
+
+PASSWORD = "benchmark-password"
+# Routes whose responses only end when the server ends them
+STREAMING_ROUTES = {"GET /communities/live"}
+
+
+def revoke_email(i: int) -> str:
+    """Users for POST /auth/revoke, one per request: revoking ends their tokens"""
+    return f"revoke{i}@bench.biddge.com"
+
+
+def percentile(ordered, pct):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return None
+
+
+def make_client(backend: str):
+    if backend == "memory":
+        from mongomock_motor import AsyncMongoMockClient
+        return AsyncMongoMockClient()
+    return server.client
+
+
+async def seed(db, args, rng):
+    """Load a synthetic catalogue and users; returns (user emails, creator email)"""
+    await db.communities.insert_many(list(communities(args.communities, rng, synthetic_counts=True)))
+    password_hash = hash_password(PASSWORD)
+    emails = [f"load{i}@bench.biddge.com" for i in range(args.users)]
+    await db.users.insert_many([
+        {"name": f"Load {i}", "email": email, "password": password_hash, "is_creator": i == 0}
+        for i, email in enumerate(emails)
+    ] + [
+        {"name": f"Revoke {i}", "email": revoke_email(i), "password": password_hash}
+        for i in range(args.auth_requests)
+    ])
+    return emails, emails[0]
+
+
+def build_routes(args, rng, tokens, creator_token, backend):
+    """name -> (request factory, acceptable status codes)"""
+    registrations = itertools.count()
+    revocations = itertools.count()
+    pick_community = lambda: community_id(rng.randrange(args.communities))
+    auth = lambda: {"Authorization": f"Bearer {rng.choice(tokens)}"}
+
+    def search_params():
+        if backend == "mongod":
+            return {"q": rng.choice(["python", "design growth", "finance"])}
+        return {"category": rng.choice(CATEGORIES), "min_members": 10}
+
+    first_page_cursor = {}
+
+    def page_two():
+        return ("GET", "/api/communities", {"params": {"limit": 50, "cursor": first_page_cursor["value"]}})
+
+    routes = {
+        "GET /test": (lambda: ("GET", "/api/test", {}), {200}),
+        "GET /healthz": (lambda: ("GET", "/api/healthz", {}), {200}),
+        "GET /readyz": (lambda: ("GET", "/api/readyz", {}), {200}),
+        "GET /communities": (lambda: ("GET", "/api/communities", {}), {200}),
+        "GET /communities?limit=50": (lambda: ("GET", "/api/communities", {"params": {"limit": 50}}), {200}),
+        "GET /communities?limit=50&cursor": (page_two, {200}),
+        "GET /communities?category=": (lambda: ("GET", "/api/communities", {"params": {"category": rng.choice(CATEGORIES), "limit": 50}}), {200}),
+        "GET /communities?format=ndjson": (lambda: ("GET", "/api/communities", {"params": {"format": "ndjson"}}), {200}),
+        "GET /communities/featured": (lambda: ("GET", "/api/communities/featured", {}), {200}),
+        "GET /categories": (lambda: ("GET", "/api/categories", {}), {200}),
+        "GET /communities/search": (lambda: ("GET", "/api/communities/search", {"params": search_params()}), {200}),
+        "GET /communities/{id}": (lambda: ("GET", f"/api/communities/{pick_community()}", {}), {200}),
+        "GET /communities/batch": (lambda: ("GET", "/api/communities/batch", {"params": {
+            "ids": ",".join(pick_community() for _ in range(20))
+        }}), {200}),
+        "GET /communities/{id}/members": (lambda: ("GET", f"/api/communities/{community_id(0)}/members", {
+            "headers": {"Authorization": f"Bearer {creator_token}"}
+        }), {200}),
+        "GET /communities/live": (lambda: ("GET", "/api/communities/live", {"params": {
+            "ids": ",".join(pick_community() for _ in range(5))
+        }}), {200}),
+        "POST /communities/{id}/join": (lambda: ("POST", f"/api/communities/{pick_community()}/join", {"headers": auth()}), {200, 400}),
+        "POST /communities/{id}/leave": (lambda: ("POST", f"/api/communities/{pick_community()}/leave", {"headers": auth()}), {200, 400}),
+        "POST /communities": (lambda: ("POST", "/api/communities", {
+            "headers": {"Authorization": f"Bearer {creator_token}"},
+            "json": {"name": "Load test", "description": "Created by load_test.py", "category": rng.choice(CATEGORIES)}
+        }), {200}),
+        "GET /users/me": (lambda: ("GET", "/api/users/me", {"headers": auth()}), {200}),
+        "GET /users/me?expand=communities": (lambda: ("GET", "/api/users/me", {
+            "params": {"expand": "communities"}, "headers": auth()
+        }), {200}),
+        "GET /users/me/communities": (lambda: ("GET", "/api/users/me/communities", {"headers": auth()}), {200}),
+        "GET /users/me/recommendations": (lambda: ("GET", "/api/users/me/recommendations", {"headers": auth()}), {200}),
+        "GET /creators/me/stats": (lambda: ("GET", "/api/creators/me/stats", {
+            "headers": {"Authorization": f"Bearer {creator_token}"}
+        }), {200}),
+        "POST /auth/login": (lambda: ("POST", "/api/auth/login", {"json": {
+            "email": f"load{rng.randrange(args.users)}@bench.biddge.com", "password": PASSWORD
+        }}), {200, 503}),
+        "POST /auth/register": (lambda: ("POST", "/api/auth/register", {"json": {
+            "name": "Load", "email": f"register{next(registrations)}@bench.biddge.com", "password": PASSWORD
+        }}), {200, 503}),
+        "POST /auth/revoke": (lambda: ("POST", "/api/auth/revoke", {"headers": {
+            "Authorization": f"Bearer {server.create_access_token({'sub': revoke_email(next(revocations))})}"
+        }}), {200}),
+        "GET /debug/db": (lambda: ("GET", "/api/debug/db", {}), {200}),
+        "GET /debug/seed": (lambda: ("GET", "/api/debug/seed", {}), {200}),
+    }
+    return routes, first_page_cursor
+
+
+async def run_route(client, factory, ok_statuses, requests, concurrency):
+    latencies = []
+    errors = 0
+    remaining = itertools.count()
+
+    async def worker():
+        nonlocal errors
+        while next(remaining) < requests:
+            method, url, kwargs = factory()
+            start = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code not in ok_statuses:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+    }
+
+
+async def end_streams():
+    """End every live count stream as soon as it opens"""
+    while True:
+        server.live_counts.close_all()
+        await asyncio.sleep(0)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=["memory", "mongod"], default="memory")
+    parser.add_argument("--db", default="biddge_load_test", help="scratch database for --backend mongod")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500, help="requests per route")
+    parser.add_argument("--auth-requests", type=int, default=50, help="requests for login/register (bcrypt)")
+    parser.add_argument("--communities", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--routes", help="comma-separated substrings; only matching routes run")
+    parser.add_argument("--output", help="write the JSON report here as well as stdout")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    server.client = make_client(args.backend)
+    server.db = server.client[args.db]
+    # Every request comes from one client address and a few accounts; measure
+    # the handlers, not the auth rate limits
+    server.auth_ip_limiter.rate = 0
+    server.auth_account_limiter.rate = 0
+
+    report = {
+        "commit": git_commit(),
+        "backend": args.backend,
+        "python": platform.python_version(),
+        "concurrency": args.concurrency,
+        "communities": args.communities,
+        "users": args.users,
+        "routes": {},
+    }
+    async with server.app.router.lifespan_context(server.app):
+        try:
+            emails, creator = await seed(server.db, args, rng)
+            await rebuild_category_stats(server.db)
+            tokens = [server.create_access_token({"sub": email}) for email in emails]
+            creator_token = server.create_access_token({"sub": creator})
+            routes, first_page_cursor = build_routes(args, rng, tokens, creator_token, args.backend)
+            wanted = args.routes.split(",") if args.routes else None
+
+            transport = httpx.ASGITransport(app=server.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+                first = await client.get("/api/communities", params={"limit": 50})
+                first_page_cursor["value"] = first.json()["next_cursor"]
+                # The member list is only shown to the creator and members
+                await client.post(f"/api/communities/{community_id(0)}/join",
+                                  headers={"Authorization": f"Bearer {creator_token}"})
+
+                for name, (factory, ok_statuses) in routes.items():
+                    if wanted and not any(part in name for part in wanted):
+                        continue
+                    requests = args.auth_requests if name.startswith("POST /auth") else args.requests
+                    closer = asyncio.create_task(end_streams()) if name in STREAMING_ROUTES else None
+                    try:
+                        report["routes"][name] = await run_route(client, factory, ok_statuses, requests, args.concurrency)
+                    finally:
+                        if closer is not None:
+                            closer.cancel()
+                    print(f"   {name}: {report['routes'][name]}", file=sys.stderr)
+        finally:
+            if args.backend == "mongod":
+                await server.client.drop_database(args.db)
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
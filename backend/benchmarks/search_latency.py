@@ -0,0 +1,162 @@
+"""
+Latency of GET /api/communities/search on a synthetic catalogue.
+
+Loads --communities synthetic communities (100k by default), then times
+--queries searches with random terms, categories and member-count floors
+through the ASGI app, twice:
+
+  uncached   search_cache disabled, so every request reaches Mongo
+  cached     search_cache at SEARCH_CACHE_SIZE, with the queries drawn from
+             --distinct different ones (repeat searches, as on a busy day),
+             each searched once beforehand, so this times cache hits
+
+Prints a JSON summary (also written to --output) and, on mongod, exits 1 if
+the uncached p99 is above --target-ms.
+
+Two database backends, as in load_test.py:
+  --backend mongod   a real server at MONGO_URL, in a scratch database that is
+                     dropped afterwards; indexes are built first
+  --backend memory   in-memory stand-in (mongomock-motor). It has no $text
+                     and no indexes, so queries use category/min_members only
+                     and the uncached numbers are a full scan in Python:
+                     compare them between commits, not against the budget.
+                     It blocks the event loop, so use --concurrency 1 (more
+                     only measures queueing).
+
+Only a --backend mongod run can show the p99 budget is met:
+
+    cd backend && python benchmarks/search_latency.py --communities 100000 --target-ms 50 --output search.json
+    python benchmarks/search_latency.py --backend memory --concurrency 1 --communities 5000 --queries 50
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx
+
+import server
+from bulk_load import load_documents
+from generate_dataset import CATEGORIES, WORDS, communities
+from indexes import ensure_indexes
+from load_test import git_commit, make_client
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def load(db, count, rng, backend):
+    if backend == "memory":
+        await db.communities.insert_many(list(communities(count, rng, synthetic_counts=True)))
+        return
+    await ensure_indexes(db)
+    await load_documents(db, "communities", communities(count, rng, synthetic_counts=True), batch_size=5000)
+
+
+def random_query(rng, backend):
+    params = {"limit": 20}
+    if backend == "mongod":
+        params["q"] = " ".join(rng.sample(WORDS, rng.choice([1, 2])))
+    if backend == "memory" or rng.random() < 0.3:
+        params["category"] = rng.choice(CATEGORIES)
+    if rng.random() < 0.3:
+        params["min_members"] = rng.choice([10, 50, 100])
+    return params
+
+
+async def time_queries(client, queries, concurrency):
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(params):
+        async with semaphore:
+            begin = time.perf_counter()
+            response = await client.get("/api/communities/search", params=params)
+            response.raise_for_status()
+            latencies.append((time.perf_counter() - begin) * 1000)
+
+    await asyncio.gather(*(run(params) for params in queries))
+    return {
+        "queries": len(latencies),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=["memory", "mongod"], default="mongod")
+    parser.add_argument("--communities", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--distinct", type=int, default=50, help="different queries in the cached run")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--target-ms", type=float, default=50.0, help="uncached p99 budget")
+    parser.add_argument("--db", default="biddge_search_bench", help="scratch database (dropped afterwards)")
+    parser.add_argument("--output", help="write the JSON report here as well as stdout")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    server.client = make_client(args.backend)
+    server.db = server.client[args.db]
+    cache_size = server.search_cache.maxsize
+
+    start = time.perf_counter()
+    await load(server.db, args.communities, rng, args.backend)
+    load_s = time.perf_counter() - start
+
+    uncached_queries = [random_query(rng, args.backend) for _ in range(args.queries)]
+    distinct = [random_query(rng, args.backend) for _ in range(args.distinct)]
+    cached_queries = [rng.choice(distinct) for _ in range(args.queries)]
+
+    try:
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            server.search_cache.maxsize = 0
+            uncached = await time_queries(client, uncached_queries, args.concurrency)
+            print(f"   uncached: {uncached}", file=sys.stderr)
+            server.search_cache.maxsize = cache_size
+            # Hits are what is measured here, not expiry
+            server.search_cache.ttl = float("inf")
+            server.search_cache.clear()
+            await time_queries(client, distinct, args.concurrency)
+            hits = server.search_cache.hits
+            cached = await time_queries(client, cached_queries, args.concurrency)
+            cached["hit_ratio"] = round((server.search_cache.hits - hits) / max(1, args.queries), 3)
+            print(f"   cached: {cached}", file=sys.stderr)
+    finally:
+        if args.backend == "mongod":
+            await server.client.drop_database(args.db)
+
+    report = {
+        "commit": git_commit(),
+        "backend": args.backend,
+        "python": platform.python_version(),
+        "communities": args.communities,
+        "concurrency": args.concurrency,
+        "search_cache_size": cache_size,
+        "load_s": round(load_s, 1),
+        "target_p99_ms": args.target_ms,
+        "uncached": uncached,
+        "cached": cached,
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(output + "\n")
+    # The stand-in has no indexes to hold to a budget
+    return 0 if args.backend == "memory" or uncached["p99_ms"] <= args.target_ms else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
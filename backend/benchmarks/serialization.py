@@ -0,0 +1,88 @@
+"""
+Serialization cost of the community list and create responses.
+
+Encodes --sizes synthetic catalogues (1k and 10k communities by default) the
+ways the API has done it and reports the median time per response:
+
+  jsonable_encoder+json   FastAPI's default path for a returned list
+  json per document       the old streaming path (stdlib json.dumps per doc)
+  orjson                  ORJSONResponse / encode_json on the whole list
+  orjson per document     the current streaming path on a cache miss
+  cached body             a cache hit: the pre-encoded bytes, no encoding
+
+and, for POST /communities, validating through the Community model before
+encoding versus encoding the document directly. No database is needed.
+
+    cd backend && python benchmarks/serialization.py --sizes 1000,10000
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+import server
+from generate_dataset import communities
+
+
+def median_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 4)
+
+
+def json_per_document(docs):
+    return ("[" + ",".join(json.dumps(doc, default=str) for doc in docs) + "]").encode()
+
+
+def orjson_per_document(docs):
+    return b"[" + b",".join(server.encode_json(doc) for doc in docs) + b"]"
+
+
+def model_then_encode(doc):
+    return json.dumps(jsonable_encoder(server.Community(**doc).model_dump())).encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000", help="comma-separated catalogue sizes")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    report = {"sizes": {}}
+    for size in (int(part) for part in args.sizes.split(",")):
+        docs = list(communities(size, random.Random(args.seed), synthetic_counts=True))
+        cached = server.encode_json(docs)
+        assert orjson.loads(cached) == json.loads(json_per_document(docs))
+
+        report["sizes"][size] = {
+            "body_bytes": len(cached),
+            "jsonable_encoder+json_ms": median_ms(lambda: json.dumps(jsonable_encoder(docs)).encode(), args.repeat),
+            "json_per_document_ms": median_ms(lambda: json_per_document(docs), args.repeat),
+            "orjson_ms": median_ms(lambda: server.encode_json(docs), args.repeat),
+            "orjson_per_document_ms": median_ms(lambda: orjson_per_document(docs), args.repeat),
+            "cached_body_ms": median_ms(lambda: server.Response(cached, media_type="application/json"), args.repeat),
+        }
+        print(f"   {size}: {report['sizes'][size]}", file=sys.stderr)
+
+    doc = next(communities(1, random.Random(args.seed)))
+    report["create_community"] = {
+        "model_validate+json_ms": median_ms(lambda: model_then_encode(doc), args.repeat * 100),
+        "orjson_ms": median_ms(lambda: server.encode_json(doc), args.repeat * 100),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Trending leaderboard read and update cost as the number of communities grows.
+
+For each --sizes value, gives every community some join activity spread over
+a simulated day, then reports the median time of:
+
+  top_k           TrendingBoard.top(k), what /communities/featured reads
+  record          one join/leave tick of --tick-changes deltas
+  nlargest        heapq.nlargest(k) over all scores, i.e. recomputing the
+                  ranking per request (the baseline top_k should stay flat
+                  against)
+
+No database is needed. Reports JSON.
+
+    cd backend && python benchmarks/trending.py --sizes 1000,10000,100000,1000000
+"""
+import argparse
+import heapq
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from trending import TrendingBoard
+
+
+def median_us(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    return round(statistics.median(samples), 3)
+
+
+def run(size, args):
+    rng = random.Random(args.seed)
+    now = [0.0]
+    board = TrendingBoard(half_life=6 * 3600, clock=lambda: now[0])
+    ids = [f"c{i}" for i in range(size)]
+
+    # A day of activity, skewed so a few communities lead
+    for key in ids:
+        now[0] = rng.uniform(0, 86_400)
+        board.record({key: max(1, int(rng.paretovariate(1.5)))})
+    now[0] = 86_400
+
+    def tick():
+        now[0] += 1
+        board.record({rng.choice(ids): rng.choice((1, 1, -1)) for _ in range(args.tick_changes)})
+
+    return {
+        "tracked": len(board),
+        f"top_{args.k}_us": median_us(lambda: board.top(args.k), args.repeat),
+        "record_tick_us": median_us(tick, args.repeat),
+        f"nlargest_{args.k}_us": median_us(
+            lambda: heapq.nlargest(args.k, board.scores.items(), key=lambda item: item[1]),
+            max(3, args.repeat // 100)
+        ),
+        "rebuilds": board.rebuilds,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma-separated community counts")
+    parser.add_argument("--k", type=int, default=6)
+    parser.add_argument("--tick-changes", type=int, default=50, help="communities changed per record() call")
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    report = {"k": args.k, "sizes": {}}
+    for size in (int(part) for part in args.sizes.split(",")):
+        report["sizes"][size] = run(size, args)
+        print(f"   {size}: {report['sizes'][size]}", file=sys.stderr)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
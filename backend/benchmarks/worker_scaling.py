@@ -0,0 +1,125 @@
+"""
+Throughput of the production server (serve.py) as the worker count grows.
+
+For each --workers value, starts `python serve.py` with WEB_CONCURRENCY set,
+waits for it to answer, then drives --paths over real sockets for --duration
+seconds from --client-processes load generator processes (so the client is
+not the bottleneck) and reports requests/s and p50/p99 latency as JSON.
+
+The server needs a reachable MONGO_URL; seed it first (python
+seed_communities.py, or bulk_load.py with a generated dataset) so the
+listing paths return data.
+
+    cd backend && python benchmarks/worker_scaling.py --workers 1,2,4 --duration 15
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+
+def percentile(ordered, pct):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def drive(base_url, paths, concurrency, duration):
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        async def worker(offset):
+            nonlocal errors
+            i = offset
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(paths[i % len(paths)])
+                    if response.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append((time.perf_counter() - start) * 1000)
+                i += 1
+
+        await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    return latencies, errors
+
+
+def client_process(args):
+    base_url, paths, concurrency, duration = args
+    return asyncio.run(drive(base_url, paths, concurrency, duration))
+
+
+def wait_until_ready(base_url, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{base_url}/api/test", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"server at {base_url} did not become ready")
+
+
+def run(workers, args):
+    base_url = f"http://127.0.0.1:{args.port}"
+    env = {**os.environ, "WEB_CONCURRENCY": str(workers), "PORT": str(args.port),
+           "HOST": "127.0.0.1", "LOG_LEVEL": "WARNING"}
+    server = subprocess.Popen([sys.executable, "serve.py"], cwd=BACKEND, env=env)
+    try:
+        wait_until_ready(base_url)
+        # Warm caches and connection pools in every worker
+        asyncio.run(drive(base_url, args.paths, args.concurrency, 2))
+
+        per_process = max(1, args.concurrency // args.client_processes)
+        jobs = [(base_url, args.paths, per_process, args.duration)] * args.client_processes
+        with multiprocessing.Pool(args.client_processes) as pool:
+            results = pool.map(client_process, jobs)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+
+    latencies = sorted(latency for result, _ in results for latency in result)
+    return {
+        "requests": len(latencies),
+        "errors": sum(errors for _, errors in results),
+        "throughput_rps": round(len(latencies) / args.duration, 1),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default="1,2,4", help="comma-separated worker counts")
+    parser.add_argument("--paths", default="/api/communities/featured,/api/communities?limit=50,/api/test",
+                        help="comma-separated paths, requested round-robin")
+    parser.add_argument("--concurrency", type=int, default=64, help="open connections across all clients")
+    parser.add_argument("--client-processes", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per worker count")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    args.paths = args.paths.split(",")
+
+    report = {"cpus": os.cpu_count(), "concurrency": args.concurrency, "paths": args.paths, "workers": {}}
+    for workers in (int(part) for part in args.workers.split(",")):
+        report["workers"][workers] = run(workers, args)
+        print(f"   {workers} workers: {report['workers'][workers]}", file=sys.stderr)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
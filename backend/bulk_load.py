@@ -0,0 +1,182 @@
+"""
+Streaming bulk loader for communities, users and memberships.
+
+Reads NDJSON (.ndjson / .jsonl) or CSV files, optionally gzipped, one line at
+a time and writes them in unordered bulk_write batches of upserts keyed by
+communities.id, users.email and memberships.(community_id, user_email), so
+rerunning a load is idempotent. Reloading a community or user updates its
+fields but not the counts that live traffic maintains (member_count), which
+are only set when the document is new. The collection is taken from the file name
+(communities*, users*, memberships*) unless --collection is given. The next
+batch is read while the previous one is being written.
+
+Users' `password` field must already be a bcrypt hash.
+
+    python bulk_load.py data/seed_communities.ndjson
+    python bulk_load.py communities.csv users.ndjson.gz memberships.ndjson.gz --reconcile
+"""
+import argparse
+import asyncio
+import csv
+import gzip
+import json
+import os
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+
+from indexes import ensure_indexes
+from reconcile_counts import rebuild_category_stats, reconcile_member_counts
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+SEED_FILE = ROOT_DIR / "data" / "seed_communities.ndjson"
+
+KEYS = {
+    "communities": ("id",),
+    "users": ("email",),
+    "memberships": ("community_id", "user_email"),
+}
+INT_FIELDS = {"member_count"}
+# Fields the server keeps up to date once a document exists (member_count via
+# join/leave and the reconciler): a load only provides their initial value
+LIVE_FIELDS = {
+    "communities": ("member_count",),
+    "users": ("joined_communities",),
+}
+BOOL_FIELDS = {"is_creator"}
+
+
+def collection_for(path: Path) -> str:
+    for collection in KEYS:
+        if path.name.startswith(collection):
+            return collection
+    raise ValueError(f"Can't tell which collection {path.name} belongs to; pass --collection")
+
+
+def coerce_csv_row(row: dict) -> dict:
+    """CSV cells are all strings: restore numbers, booleans and nulls"""
+    doc = {}
+    for field, value in row.items():
+        if value == "":
+            doc[field] = None
+        elif field in INT_FIELDS:
+            doc[field] = int(value)
+        elif field in BOOL_FIELDS:
+            doc[field] = value.strip().lower() in ("1", "true", "yes")
+        else:
+            doc[field] = value
+    return doc
+
+
+def read_documents(path: Path):
+    """Yield one document per NDJSON line or CSV row without loading the file"""
+    opener = gzip.open if path.suffix == ".gz" else open
+    data_suffix = Path(path.stem).suffix if path.suffix == ".gz" else path.suffix
+    with opener(path, "rt", encoding="utf-8", newline="") as f:
+        if data_suffix == ".csv":
+            for row in csv.DictReader(f):
+                yield coerce_csv_row(row)
+        else:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+
+def upsert(collection: str, doc: dict) -> UpdateOne:
+    doc.pop("_id", None)
+    key = {field: doc[field] for field in KEYS[collection]}
+    if collection == "memberships":
+        # Keep the original joined_at when a membership is loaded again
+        return UpdateOne(key, {"$setOnInsert": doc}, upsert=True)
+    initial = {field: doc.pop(field) for field in LIVE_FIELDS.get(collection, ()) if field in doc}
+    update = {"$set": doc}
+    if initial:
+        update["$setOnInsert"] = initial
+    return UpdateOne(key, update, upsert=True)
+
+
+async def load_documents(db, collection: str, docs, batch_size: int = 1000, label: str = None) -> int:
+    """Upsert docs into collection in batches; returns the number of documents written"""
+    label = label or collection
+    loaded = 0
+    in_flight = None
+    start = time.perf_counter()
+    batch = []
+
+    async def write(operations):
+        await db[collection].bulk_write(operations, ordered=False)
+
+    for doc in docs:
+        batch.append(upsert(collection, doc))
+        if len(batch) >= batch_size:
+            if in_flight:
+                await in_flight
+            in_flight = asyncio.create_task(write(batch))
+            loaded += len(batch)
+            batch = []
+            if loaded % (batch_size * 10) == 0:
+                rate = loaded / (time.perf_counter() - start)
+                print(f"   {label}: {loaded} docs ({rate:.0f}/s)")
+    if in_flight:
+        await in_flight
+    if batch:
+        await write(batch)
+        loaded += len(batch)
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ {label}: loaded {loaded} {collection} in {elapsed:.1f}s ({loaded / max(elapsed, 1e-9):.0f}/s)")
+    return loaded
+
+
+async def load_file(db, path: Path, collection: str = None, batch_size: int = 1000) -> int:
+    collection = collection or collection_for(path)
+    return await load_documents(db, collection, read_documents(path), batch_size, label=path.name)
+
+
+async def load_seed_communities(db) -> int:
+    """Upsert the built-in demo communities from data/seed_communities.ndjson"""
+    loaded = await load_file(db, SEED_FILE, "communities")
+    await rebuild_category_stats(db)
+    return loaded
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="+", type=Path)
+    parser.add_argument("--collection", choices=sorted(KEYS), help="collection for every file")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--reconcile", action="store_true",
+                        help="recompute member_count from memberships after loading")
+    args = parser.parse_args()
+
+    mongo_url = os.getenv('MONGO_URL', 'mongodb://localhost:27017')
+    db_name = os.getenv('DB_NAME', 'biddge_db')
+    client = AsyncIOMotorClient(mongo_url)
+    db = client[db_name]
+
+    try:
+        await ensure_indexes(db)
+        collections = set()
+        for path in args.files:
+            collection = args.collection or collection_for(path)
+            await load_file(db, path, collection, args.batch_size)
+            collections.add(collection)
+
+        if args.reconcile:
+            drifted = await reconcile_member_counts(db, batch_size=args.batch_size)
+            print(f"✅ Reconciled member_count on {len(drifted)} communities")
+        if args.reconcile or "communities" in collections:
+            categories = await rebuild_category_stats(db)
+            print(f"✅ Rebuilt category_stats for {categories} categories")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+"""
+Small in-process caches used by the API server.
+
+Each uvicorn worker keeps its own copy, so anything cached here must be
+invalidated by the write paths in the same worker (and, optionally, by a
+Mongo change stream for the other workers).
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """
+    LRU cache with a per-entry time-to-live and a bound on the number of entries.
+
+    `generation` is bumped on every clear(); a reader that started a slow fill
+    before a write can pass the generation it saw to set() so that a stale
+    result is not stored after the cache has been invalidated.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value, generation=None, ttl=None):
+        if self.maxsize <= 0:
+            return
+        if generation is not None and generation != self.generation:
+            return
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+        self.generation += 1
+
+    def __len__(self):
+        return len(self._data)
+
+
+async def invalidate_on_change(collection, caches):
+    """
+    Clear `caches` whenever `collection` changes, via a Mongo change stream.
+
+    Change streams need a replica set; on a standalone server this logs once
+    and returns, leaving the TTL as the only cross-worker expiry.
+    """
+    while True:
+        try:
+            async with collection.watch() as stream:
+                async for _change in stream:
+                    for cache in caches:
+                        cache.clear()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Change stream unavailable, cache relies on TTL", extra={"collection": collection.name, "error": str(e)})
+            return
@@ -0,0 +1,92 @@
+"""
+Write-coalescing buffer for counters such as communities.member_count.
+
+With MEMBER_COUNT_BUFFER=1 the server adds each join/leave delta here instead
+of issuing an $inc per request, and a background task flushes the summed
+deltas in one unordered bulk_write every flush interval (and on shutdown).
+A viral community then costs one write per interval, not one per join.
+member_count can lag by up to one interval, and deltas still pending in a
+worker that crashes are lost; reconcile_counts.py repairs that from the
+memberships collection.
+
+The same buffer keeps the per-category member totals in category_stats.
+"""
+import asyncio
+import logging
+
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+
+class CounterBuffer:
+    def __init__(self, collection, key_field: str = "id", count_field: str = "member_count",
+                 upsert: bool = False, interval: float = 1.0, max_pending: int = 1000, on_flush=None):
+        self.collection = collection
+        self.key_field = key_field
+        self.count_field = count_field
+        self.upsert = upsert
+        self.interval = interval
+        self.max_pending = max_pending
+        self.on_flush = on_flush
+        self.pending = {}
+        self.flushed_writes = 0
+        self._lock = asyncio.Lock()
+        self._task = None
+        self._early_flush = None
+
+    def add(self, key: str, delta: int):
+        self.pending[key] = self.pending.get(key, 0) + delta
+        if len(self.pending) >= self.max_pending and not self._lock.locked():
+            self._early_flush = asyncio.get_running_loop().create_task(self._flush_logged())
+
+    async def flush(self):
+        async with self._lock:
+            deltas, self.pending = self.pending, {}
+            operations = [
+                UpdateOne({self.key_field: key}, {"$inc": {self.count_field: delta}}, upsert=self.upsert)
+                for key, delta in deltas.items()
+                if delta
+            ]
+            if not operations:
+                return 0
+            try:
+                await self.collection.bulk_write(operations, ordered=False)
+            except BaseException:
+                # Put the deltas back so the next flush retries them, also when
+                # the flush is cancelled mid-write (e.g. at shutdown)
+                for key, delta in deltas.items():
+                    self.pending[key] = self.pending.get(key, 0) + delta
+                raise
+            self.flushed_writes += len(operations)
+            if self.on_flush:
+                self.on_flush()
+            return len(operations)
+
+    async def _flush_logged(self):
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Counter flush failed, will retry", extra={"count_field": self.count_field})
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self._flush_logged()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop the flush loop and flush what is left; never raises, so shutdown carries on"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._early_flush is not None:
+            await asyncio.gather(self._early_flush, return_exceptions=True)
+        await self._flush_logged()
@@ -0,0 +1,141 @@
+"""
+Synthetic dataset generator for load and index testing.
+
+Writes communities, users and memberships as NDJSON files that bulk_load.py
+can stream into Mongo. Output is deterministic for a given --seed, so the
+same dataset can be regenerated on another machine.
+
+Community popularity is skewed (a few communities get most of the joins),
+like the real catalogue. Communities are written with member_count 0; load
+the memberships with `bulk_load.py ... --reconcile` to fill in true counts.
+
+    python generate_dataset.py --communities 10000 --users 100000 --memberships-per-user 5 --out data/generated
+    python bulk_load.py data/generated/communities.ndjson.gz data/generated/users.ndjson.gz \\
+        data/generated/memberships.ndjson.gz --reconcile
+"""
+import argparse
+import gzip
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+CATEGORIES = ["Career Growth", "Startup Builders", "AI & ML Hub", "Tech Community",
+              "Fitness & Health", "Design Circle", "Marketing", "Finance"]
+WORDS = ["python", "design", "startup", "founders", "fitness", "running", "finance", "investing",
+         "marketing", "seo", "machine", "learning", "career", "mentors", "product", "growth",
+         "react", "data", "cloud", "yoga", "nutrition", "crypto", "writing", "photography"]
+FIRST_NAMES = ["Aarav", "Diya", "Maya", "Liam", "Noah", "Zara", "Ishaan", "Emma", "Kabir", "Sara"]
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def community_id(i: int) -> str:
+    return f"gen-community-{i:08d}"
+
+
+def user_email(i: int) -> str:
+    return f"user{i:08d}@example.com"
+
+
+def communities(count: int, rng: random.Random, synthetic_counts: bool = False):
+    """
+    Yield `count` communities in created_at order. With synthetic_counts,
+    member_count is drawn from a heavy-tailed distribution instead of 0 (for
+    catalogue-only benchmarks that load no memberships).
+    """
+    step = (2 * 365 * 24 * 3600) / max(count, 1)
+    for i in range(count):
+        words = rng.sample(WORDS, 6)
+        yield {
+            "id": community_id(i),
+            "name": f"{words[0].title()} {words[1].title()} {i}",
+            "description": " ".join(words) + " community for people who care about " + words[2],
+            "category": rng.choice(CATEGORIES),
+            "creator_id": user_email(i % 1000),
+            "creator_name": f"{rng.choice(FIRST_NAMES)} Creator",
+            "member_count": int(rng.paretovariate(1.2) * 10) if synthetic_counts else 0,
+            "image_url": None,
+            "created_at": (EPOCH + timedelta(seconds=i * step)).isoformat(),
+        }
+
+
+def users(count: int, rng: random.Random, password_hash: str):
+    """Yield `count` users that all share one precomputed password hash"""
+    for i in range(count):
+        yield {
+            "name": f"{rng.choice(FIRST_NAMES)} {i}",
+            "email": user_email(i),
+            "password": password_hash,
+            "is_creator": i < 1000,
+            "created_at": (EPOCH + timedelta(minutes=i)).isoformat(),
+        }
+
+
+def memberships(user_count: int, community_count: int, per_user: int, rng: random.Random, skew: float = 3.0):
+    """
+    Yield about per_user memberships per user. Community i is picked with
+    probability falling off as a power of i, so low ids are the popular ones.
+    """
+    for u in range(user_count):
+        joined = set()
+        for _ in range(rng.randint(0, 2 * per_user)):
+            joined.add(min(community_count - 1, int(community_count * rng.random() ** skew)))
+        for c in sorted(joined):
+            yield {
+                "community_id": community_id(c),
+                "user_email": user_email(u),
+                "user_name": f"User {u}",
+                "joined_at": (EPOCH + timedelta(minutes=u, seconds=c % 60)).isoformat(),
+            }
+
+
+def write_ndjson(path: Path, docs, compress: bool) -> int:
+    opener = gzip.open if compress else open
+    written = 0
+    start = time.perf_counter()
+    with opener(path, "wt", encoding="utf-8") as f:
+        for doc in docs:
+            f.write(json.dumps(doc, ensure_ascii=False))
+            f.write("\n")
+            written += 1
+            if written % 100_000 == 0:
+                rate = written / (time.perf_counter() - start)
+                print(f"   {path.name}: {written} docs ({rate:.0f}/s)")
+    print(f"✅ Wrote {written} docs to {path}")
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--communities", type=int, default=10_000)
+    parser.add_argument("--users", type=int, default=0)
+    parser.add_argument("--memberships-per-user", type=int, default=5)
+    parser.add_argument("--synthetic-counts", action="store_true",
+                        help="random member_count on communities (when not loading memberships)")
+    parser.add_argument("--password", default="password123", help="password shared by every generated user")
+    parser.add_argument("--out", default="data/generated")
+    parser.add_argument("--gzip", action="store_true")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+    suffix = ".ndjson.gz" if args.gzip else ".ndjson"
+
+    write_ndjson(out / f"communities{suffix}", communities(args.communities, rng, args.synthetic_counts), args.gzip)
+    if args.users:
+        # One bcrypt hash for everyone: hashing millions of passwords would dominate the run
+        from passwords import hash_password
+        write_ndjson(out / f"users{suffix}", users(args.users, rng, hash_password(args.password)), args.gzip)
+        if args.memberships_per_user and args.communities:
+            write_ndjson(
+                out / f"memberships{suffix}",
+                memberships(args.users, args.communities, args.memberships_per_user, rng),
+                args.gzip
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Index bootstrap and query-plan verification.
+
+The server calls ensure_indexes() at startup. It can also be run by hand:
+
+    python indexes.py            # create any missing indexes
+    python indexes.py --check    # also explain() every endpoint query shape,
+                                 # exit 1 if any of them is a COLLSCAN
+"""
+import argparse
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+INDEXES = {
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    ],
+    "communities": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        # Serves the (created_at, id) keyset listing and the featured sort
+        IndexModel([("created_at", ASCENDING), ("id", ASCENDING)], name="created_at_id"),
+        # GET /communities?category= in (created_at, id) order
+        IndexModel([("category", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)], name="category_created_at_id"),
+        IndexModel([("creator_id", ASCENDING)], name="creator_id"),
+        # GET /communities/search: text relevance, and member_count ranking without q
+        IndexModel(
+            [("name", TEXT), ("description", TEXT), ("category", TEXT)],
+            name="search_text",
+            weights={"name": 10, "category": 5, "description": 1}
+        ),
+        IndexModel([("member_count", DESCENDING), ("id", ASCENDING)], name="member_count_id"),
+    ],
+    "category_stats": [
+        IndexModel([("category", ASCENDING)], name="category_unique", unique=True),
+        IndexModel([("community_count", DESCENDING)], name="community_count"),
+    ],
+    "memberships": [
+        # One edge per (community, user)
+        IndexModel([("community_id", ASCENDING), ("user_email", ASCENDING)], name="community_user_unique", unique=True),
+        # Pages a community's members in join order without exposing emails
+        IndexModel([("community_id", ASCENDING), ("_id", ASCENDING)], name="community_id_order"),
+        # Pages a user's communities
+        IndexModel([("user_email", ASCENDING), ("community_id", ASCENDING)], name="user_community"),
+    ],
+    "community_neighbors": [
+        # Written by recommendations.py, read by /users/me/recommendations
+        IndexModel([("community_id", ASCENDING)], name="community_id_unique", unique=True),
+        # Removes lists left over from an earlier run
+        IndexModel([("computed_at", ASCENDING)], name="computed_at"),
+    ],
+    "membership_events": [
+        # Append-only; read only by membership_events.py --rebuild
+        IndexModel([("at", ASCENDING)], name="at"),
+    ],
+    "membership_daily": [
+        # One rollup per community per UTC day, upserted by each event flush
+        IndexModel([("community_id", ASCENDING), ("day", ASCENDING)], name="community_day_unique", unique=True),
+        # GET /creators/me/stats
+        IndexModel([("creator_id", ASCENDING), ("day", ASCENDING)], name="creator_day"),
+    ],
+    "revocations": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        # Incremental refresh of each worker's in-memory revocation set
+        IndexModel([("updated_at", ASCENDING)], name="updated_at"),
+        # Dropped once every token it could apply to has expired
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ],
+}
+
+# (description, collection, filter, sort, limit) for every query the API issues.
+# Updates are checked through the equivalent find, which plans identically.
+QUERY_SHAPES = [
+    ("user by email (auth, login, register, join/leave)", "users", {"email": "probe@example.com"}, None, 1),
+    ("community by id (get, join, leave)", "communities", {"id": "probe"}, None, 1),
+    ("community listing", "communities", {}, {"created_at": ASCENDING, "id": ASCENDING}, 51),
+    ("community listing after cursor", "communities", {
+        "$or": [
+            {"created_at": {"$gt": "1970-01-01T00:00:00"}},
+            {"created_at": "1970-01-01T00:00:00", "id": {"$gt": "probe"}},
+        ]
+    }, {"created_at": ASCENDING, "id": ASCENDING}, 51),
+    ("trending communities", "communities", {"id": {"$in": ["probe"]}}, None, 6),
+    ("featured communities (newest)", "communities", {"id": {"$nin": ["probe"]}}, {"created_at": DESCENDING}, 6),
+    ("communities by category", "communities", {"category": "probe"}, {"created_at": ASCENDING, "id": ASCENDING}, 51),
+    ("category facets", "category_stats", {"community_count": {"$gt": 0}}, {"community_count": DESCENDING}, 500),
+    ("communities by creator", "communities", {"creator_id": "probe@example.com"}, None, 50),
+    ("community search", "communities", {"$text": {"$search": "probe"}}, None, 21),
+    ("community search by size", "communities", {"member_count": {"$gte": 10}}, {"member_count": DESCENDING, "id": ASCENDING}, 21),
+    ("join/leave membership edge", "memberships", {"community_id": "probe", "user_email": "probe@example.com"}, None, 1),
+    ("community members page", "memberships", {"community_id": "probe", "_id": {"$gt": "000000000000000000000000"}}, {"_id": ASCENDING}, 51),
+    ("user's communities page", "memberships", {"user_email": "probe@example.com", "community_id": {"$gt": "a"}}, {"community_id": ASCENDING}, 51),
+    ("recommendation neighbors", "community_neighbors", {"community_id": {"$in": ["probe"]}}, None, 100),
+    ("recommendation job membership scan", "memberships", {}, {"user_email": ASCENDING, "community_id": ASCENDING}, 10000),
+    ("creator stats rollups", "membership_daily", {"creator_id": "probe@example.com", "day": {"$gte": "1970-01-01"}}, None, 1000),
+    ("revocations since last refresh", "revocations", {"updated_at": {"$gte": "1970-01-01T00:00:00"}}, {"updated_at": ASCENDING}, 1000),
+]
+
+
+async def ensure_indexes(db):
+    """Create every index in INDEXES (a no-op for indexes that already exist)"""
+    created = {}
+    for collection, indexes in INDEXES.items():
+        created[collection] = await db[collection].create_indexes(indexes)
+    return created
+
+
+def plan_stages(plan):
+    """Yield every stage name in an explain() plan tree"""
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from plan_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from plan_stages(item)
+
+
+async def check_query_plans(db):
+    """Return (description, stages) for every query shape whose winning plan is a COLLSCAN"""
+    failures = []
+    for description, collection, query, sort, limit in QUERY_SHAPES:
+        find = {"find": collection, "filter": query, "limit": limit}
+        if sort:
+            find["sort"] = sort
+        explain = await db.command({"explain": find, "verbosity": "queryPlanner"})
+        stages = list(plan_stages(explain["queryPlanner"]["winningPlan"]))
+        if "COLLSCAN" in stages:
+            failures.append((description, stages))
+    return failures
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Create indexes and verify query plans")
+    parser.add_argument("--check", action="store_true", help="fail if any endpoint query is a COLLSCAN")
+    args = parser.parse_args()
+
+    mongo_url = os.getenv('MONGO_URL', 'mongodb://localhost:27017')
+    db_name = os.getenv('DB_NAME', 'biddge_db')
+    client = AsyncIOMotorClient(mongo_url)
+    db = client[db_name]
+
+    try:
+        created = await ensure_indexes(db)
+        for collection, names in created.items():
+            print(f"📇 {collection}: {', '.join(names)}")
+
+        if args.check:
+            failures = await check_query_plans(db)
+            for description, stages in failures:
+                print(f"❌ COLLSCAN: {description} ({' -> '.join(stages)})")
+            if failures:
+                return 1
+            print(f"✅ All {len(QUERY_SHAPES)} query shapes use an index")
+        return 0
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
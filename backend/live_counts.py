@@ -0,0 +1,246 @@
+"""
+Live member_count updates over Server-Sent Events.
+
+Join/leave add their +1/-1 to a CountBroadcaster instead of notifying anyone
+directly. Every tick the broadcaster swaps out the summed deltas and sends
+each subscriber one `counts` event with the deltas for the communities it
+follows, so a viral community costs one message per subscriber per tick no
+matter how many joins it gets. Keep-alive comments go out from the same loop,
+so there are no per-connection timers.
+
+Each subscriber has a bounded queue. A subscriber whose queue is full (a
+client that stopped reading) is dropped on the spot and its stream closed;
+the broadcaster never waits on a client. EventSource reconnects on its own,
+and the frontend refetches counts when it does.
+
+Workers share deltas through a small capped collection: at each tick a worker
+that saw joins/leaves inserts one {worker, deltas} document, and every worker
+tails the collection and folds in the other workers' deltas. This works on a
+standalone server too (tailable cursors don't need a replica set). If tailing
+isn't available, each worker only streams its own joins/leaves.
+"""
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timezone
+
+import orjson
+from pymongo import CursorType
+from pymongo.errors import CollectionInvalid
+
+logger = logging.getLogger(__name__)
+
+KEEPALIVE = b": keepalive\n\n"
+
+
+def sse_event(event: str, data) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+class Subscriber:
+    __slots__ = ("communities", "queue")
+
+    def __init__(self, communities, queue_size: int):
+        self.communities = communities  # frozenset of ids, or None for every community
+        self.queue = asyncio.Queue(maxsize=queue_size)
+
+
+class CountBroadcaster:
+    def __init__(self, tick: float = 1.0, queue_size: int = 16, max_subscribers: int = 10_000,
+                 keepalive: float = 15.0, events=None, on_tick=None):
+        self.tick = tick
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self.keepalive = keepalive
+        self.events = events  # capped collection shared by the workers, or None
+        self.on_tick = on_tick  # called with each tick's deltas before they are sent
+        self.worker = uuid.uuid4().hex
+        self.pending = {}
+        self.outbox = {}  # this worker's deltas, published to the other workers
+        self.delivered = 0
+        self.dropped = 0
+        self.published = 0
+        self.received = 0
+        self._subscribers = set()
+        self._all = set()
+        self._by_community = {}
+        self._task = None
+        self._follower = None
+
+    def __len__(self):
+        return len(self._subscribers)
+
+    def add(self, community_id: str, delta: int, local: bool = True):
+        self.pending[community_id] = self.pending.get(community_id, 0) + delta
+        if local and self.events is not None:
+            self.outbox[community_id] = self.outbox.get(community_id, 0) + delta
+
+    def subscribe(self, communities=None):
+        """A new Subscriber for the given community ids (None: all), or None when full"""
+        if len(self) >= self.max_subscribers:
+            return None
+        subscriber = Subscriber(frozenset(communities) if communities is not None else None, self.queue_size)
+        self._subscribers.add(subscriber)
+        if subscriber.communities is None:
+            self._all.add(subscriber)
+        else:
+            for community_id in subscriber.communities:
+                self._by_community.setdefault(community_id, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self._subscribers.discard(subscriber)
+        if subscriber.communities is None:
+            self._all.discard(subscriber)
+            return
+        for community_id in subscriber.communities:
+            subs = self._by_community.get(community_id)
+            if subs is not None:
+                subs.discard(subscriber)
+                if not subs:
+                    del self._by_community[community_id]
+
+    def _send(self, subscriber: Subscriber, chunk: bytes):
+        try:
+            subscriber.queue.put_nowait(chunk)
+            self.delivered += 1
+        except asyncio.QueueFull:
+            # Too slow to keep up: drop it rather than buffer without bound
+            self._close(subscriber)
+            self.dropped += 1
+
+    def _close(self, subscriber: Subscriber):
+        """Unsubscribe and replace whatever is queued with None, which ends the stream"""
+        self.unsubscribe(subscriber)
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(None)
+
+    def broadcast(self):
+        """Send the deltas gathered since the last tick; returns how many communities changed"""
+        deltas = {community_id: delta for community_id, delta in self.pending.items() if delta}
+        self.pending = {}
+        if not deltas:
+            return 0
+        if self.on_tick:
+            self.on_tick(deltas)
+
+        batches = {}
+        for community_id, delta in deltas.items():
+            for subscriber in self._by_community.get(community_id, ()):
+                batches.setdefault(subscriber, {})[community_id] = delta
+        if self._all:
+            chunk = sse_event("counts", deltas)
+            for subscriber in list(self._all):
+                self._send(subscriber, chunk)
+        # Most subscribers follow a single community: encode its event once
+        single = {}
+        for subscriber, batch in batches.items():
+            if len(batch) == 1:
+                (community_id, delta), = batch.items()
+                chunk = single.get(community_id)
+                if chunk is None:
+                    chunk = single[community_id] = sse_event("counts", batch)
+            else:
+                chunk = sse_event("counts", batch)
+            self._send(subscriber, chunk)
+        return len(deltas)
+
+    def ping(self):
+        for subscriber in list(self._subscribers):
+            self._send(subscriber, KEEPALIVE)
+
+    async def publish(self):
+        if self.events is None or not self.outbox:
+            return
+        deltas, self.outbox = self.outbox, {}
+        try:
+            await self.events.insert_one({"worker": self.worker, "deltas": deltas, "at": datetime.now(timezone.utc)})
+            self.published += 1
+        except Exception:
+            logger.exception("Publishing member count deltas failed")
+
+    async def follow(self):
+        """Fold other workers' deltas into pending by tailing the events collection"""
+        # Resume point after the cursor dies: the newest `at` seen so far, plus
+        # the ids already read at that instant (ObjectIds from different
+        # processes don't sort by insertion order within a second). Mongo
+        # hands datetimes back naive, in UTC.
+        since = datetime.now(timezone.utc).replace(tzinfo=None)
+        seen = set()
+        try:
+            while True:
+                cursor = self.events.find({"at": {"$gte": since}}, cursor_type=CursorType.TAILABLE_AWAIT)
+                while cursor.alive:
+                    async for doc in cursor:
+                        if doc["_id"] in seen:
+                            continue
+                        if doc["at"] > since:
+                            since, seen = doc["at"], set()
+                        if doc["at"] == since:
+                            seen.add(doc["_id"])
+                        if doc["worker"] != self.worker:
+                            self.received += 1
+                            for community_id, delta in doc["deltas"].items():
+                                self.add(community_id, delta, local=False)
+                    await asyncio.sleep(self.tick)
+                # The cursor dies on an empty collection; retry until there is data
+                await asyncio.sleep(self.tick)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Can't tail member count events, streaming this worker's changes only",
+                           extra={"error": str(e)})
+            self.events = None
+            self.outbox = {}
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        next_ping = loop.time() + self.keepalive
+        while True:
+            await asyncio.sleep(self.tick)
+            try:
+                self.broadcast()
+                if loop.time() >= next_ping:
+                    self.ping()
+                    next_ping = loop.time() + self.keepalive
+                await self.publish()
+            except Exception:
+                logger.exception("Member count broadcast failed")
+
+    def start(self):
+        if self._task is None:
+            loop = asyncio.get_running_loop()
+            self._task = loop.create_task(self._run())
+            if self.events is not None:
+                self._follower = loop.create_task(self.follow())
+
+    async def stop(self):
+        for task in (self._task, self._follower):
+            if task is not None:
+                task.cancel()
+        self._task = self._follower = None
+        await self.publish()
+        # End every open stream so the server can shut down
+        self.close_all()
+
+    def close_all(self):
+        """End every open stream (clients reconnect on their own)"""
+        for subscriber in list(self._subscribers):
+            self._close(subscriber)
+
+    def samples(self):
+        yield "biddge_live_count_subscribers", "gauge", (), len(self)
+        yield "biddge_live_count_events_total", "counter", (), self.delivered
+        yield "biddge_live_count_dropped_subscribers_total", "counter", (), self.dropped
+        yield "biddge_live_count_published_total", "counter", (), self.published
+        yield "biddge_live_count_received_total", "counter", (), self.received
+
+
+async def ensure_events_collection(db, name: str, size: int):
+    """Create the capped collection workers share deltas through, if missing"""
+    try:
+        await db.create_collection(name, capped=True, size=size)
+    except CollectionInvalid:
+        pass  # already exists
+    return db[name]
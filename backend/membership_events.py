@@ -0,0 +1,246 @@
+"""
+Append-only join/leave events and the daily rollups behind creator analytics.
+
+The server adds an event per membership change to an EventWriter, which
+buffers them and, once per flush interval (or when max_pending build up):
+
+  1. inserts the raw events into membership_events with one unordered
+     insert_many (each event carries its _id from the start, so a retried
+     flush can't insert one twice), and
+  2. adds the joins/leaves per (community, UTC day) into membership_daily
+     with one bulk_write of $inc upserts. Each rollup document carries the
+     community's creator_id, so a creator's stats are one index range.
+
+GET /api/creators/me/stats reads only membership_daily. If Mongo is down the
+events wait in memory (up to max_buffer, oldest dropped first, counted in
+biddge_membership_events_dropped_total and logged); the rollup increments
+are kept separately, so counts stay exact even when raw events had to be
+dropped.
+
+If rollups and events ever disagree (a crash between the two writes),
+rebuild the rollups from the events, in a quiet period (joins landing while
+it runs can be counted twice or lost):
+
+    python membership_events.py --rebuild
+"""
+import argparse
+import asyncio
+import logging
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+from bson import ObjectId
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from cache import TTLCache
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY = 11000
+
+
+def day_of(at: datetime) -> str:
+    return at.astimezone(timezone.utc).strftime("%Y-%m-%d")
+
+
+class EventWriter:
+    def __init__(self, db, interval: float = 1.0, max_pending: int = 1000, max_buffer: int = 100_000):
+        self.db = db
+        self.interval = interval
+        self.max_pending = max_pending
+        self.max_buffer = max_buffer
+        self.pending = []
+        self.rollups = {}  # (community_id, day) -> [joins, leaves]
+        self.written = 0
+        self.dropped = 0
+        self._overflowing = False  # warned about drops since the last successful insert
+        self._creators = TTLCache(maxsize=10000, ttl=3600)
+        self._lock = asyncio.Lock()
+        self._task = None
+        self._early_flush = None
+
+    def add(self, community_id: str, user_email: str, joining: bool, at: datetime = None):
+        at = at or datetime.now(timezone.utc)
+        self.pending.append({
+            "_id": ObjectId(),
+            "community_id": community_id,
+            "user_email": user_email,
+            "type": "join" if joining else "leave",
+            "at": at
+        })
+        if len(self.pending) > self.max_buffer:
+            self._drop_oldest(1)
+        counts = self.rollups.setdefault((community_id, day_of(at)), [0, 0])
+        counts[0 if joining else 1] += 1
+        if len(self.pending) >= self.max_pending and not self._lock.locked():
+            self._early_flush = asyncio.get_running_loop().create_task(self._flush_logged())
+
+    def _drop_oldest(self, count: int):
+        """Drop the oldest buffered events (the rollups still count them)"""
+        del self.pending[:count]
+        self.dropped += count
+        # Once per outage, not once per event
+        if not self._overflowing:
+            self._overflowing = True
+            logger.warning("Membership event buffer full, dropping the oldest events",
+                           extra={"max_buffer": self.max_buffer, "dropped": self.dropped})
+
+    async def _insert_events(self, events):
+        try:
+            await self.db.membership_events.insert_many(events, ordered=False)
+        except BulkWriteError as e:
+            # Already inserted by a flush that failed part way through
+            if any(error["code"] != DUPLICATE_KEY for error in e.details["writeErrors"]):
+                raise
+
+    async def _creator_ids(self, community_ids) -> dict:
+        creators = {}
+        missing = []
+        for community_id in community_ids:
+            creator = self._creators.get(community_id)
+            if creator is None:
+                missing.append(community_id)
+            else:
+                creators[community_id] = creator
+        if missing:
+            cursor = self.db.communities.find({"id": {"$in": missing}}, {"_id": 0, "id": 1, "creator_id": 1})
+            async for community in cursor:
+                creators[community["id"]] = community.get("creator_id", "")
+                self._creators.set(community["id"], creators[community["id"]])
+        return creators
+
+    async def flush(self):
+        async with self._lock:
+            events, self.pending = self.pending, []
+            try:
+                if events:
+                    await self._insert_events(events)
+                    self.written += len(events)
+                    self._overflowing = False
+            except BaseException:
+                # Keep them for the next flush, also when cancelled mid-write
+                self.pending[:0] = events
+                if len(self.pending) > self.max_buffer:
+                    self._drop_oldest(len(self.pending) - self.max_buffer)
+                raise
+
+            rollups, self.rollups = self.rollups, {}
+            if not rollups:
+                return 0
+            try:
+                creators = await self._creator_ids({community_id for community_id, _ in rollups})
+                operations = [
+                    UpdateOne(
+                        {"community_id": community_id, "day": day},
+                        {"$inc": {"joins": joins, "leaves": leaves},
+                         "$setOnInsert": {"creator_id": creators.get(community_id, "")}},
+                        upsert=True
+                    )
+                    for (community_id, day), (joins, leaves) in rollups.items()
+                ]
+                await self.db.membership_daily.bulk_write(operations, ordered=False)
+            except BaseException:
+                # Put the increments back so the next flush retries them
+                for key, (joins, leaves) in rollups.items():
+                    counts = self.rollups.setdefault(key, [0, 0])
+                    counts[0] += joins
+                    counts[1] += leaves
+                raise
+            return len(operations)
+
+    async def _flush_logged(self):
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Membership event flush failed, will retry")
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self._flush_logged()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._early_flush is not None:
+            await asyncio.gather(self._early_flush, return_exceptions=True)
+        await self._flush_logged()
+
+    def samples(self):
+        yield "biddge_membership_events_pending", "gauge", (), len(self.pending)
+        yield "biddge_membership_events_written_total", "counter", (), self.written
+        yield "biddge_membership_events_dropped_total", "counter", (), self.dropped
+
+
+async def rebuild_rollups(db, batch_size: int = 1000) -> int:
+    """Recompute membership_daily from membership_events; returns the number of rollup documents"""
+    started = datetime.now(timezone.utc)
+    creators = {
+        community["id"]: community.get("creator_id", "")
+        async for community in db.communities.find({}, {"_id": 0, "id": 1, "creator_id": 1})
+    }
+    pipeline = [
+        {"$group": {
+            "_id": {"community_id": "$community_id", "day": {"$dateToString": {"format": "%Y-%m-%d", "date": "$at"}}},
+            "joins": {"$sum": {"$cond": [{"$eq": ["$type", "join"]}, 1, 0]}},
+            "leaves": {"$sum": {"$cond": [{"$eq": ["$type", "leave"]}, 1, 0]}},
+        }},
+    ]
+    written = 0
+    operations = []
+    async for row in db.membership_events.aggregate(pipeline, allowDiskUse=True):
+        community_id, day = row["_id"]["community_id"], row["_id"]["day"]
+        operations.append(UpdateOne(
+            {"community_id": community_id, "day": day},
+            {"$set": {"joins": row["joins"], "leaves": row["leaves"], "creator_id": creators.get(community_id, ""),
+                      "rebuilt_at": started}},
+            upsert=True
+        ))
+        if len(operations) >= batch_size:
+            await db.membership_daily.bulk_write(operations, ordered=False)
+            written += len(operations)
+            operations = []
+    if operations:
+        await db.membership_daily.bulk_write(operations, ordered=False)
+        written += len(operations)
+    # Days that no longer have any events
+    await db.membership_daily.delete_many({"$or": [{"rebuilt_at": {"$lt": started}}, {"rebuilt_at": {"$exists": False}}]})
+    return written
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rebuild", action="store_true", help="recompute membership_daily from membership_events")
+    args = parser.parse_args()
+    if not args.rebuild:
+        parser.print_help()
+        return
+
+    mongo_url = os.getenv('MONGO_URL', 'mongodb://localhost:27017')
+    db_name = os.getenv('DB_NAME', 'biddge_db')
+    client = AsyncIOMotorClient(mongo_url)
+    try:
+        written = await rebuild_rollups(client[db_name])
+        print(f"✅ Rebuilt {written} daily rollups from membership events")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
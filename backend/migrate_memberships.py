@@ -0,0 +1,98 @@
+"""
+Move users.joined_communities arrays into the memberships collection.
+
+Streams users that still carry the array in batches, upserts one membership
+edge per (community_id, user_email) with an unordered bulk_write, then unsets
+the array on those users. Safe to rerun: edges are upserted and users that
+were already migrated no longer match.
+
+    python migrate_memberships.py --batch-size 500
+    python migrate_memberships.py --keep-arrays   # copy only, leave arrays in place
+"""
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+
+from indexes import ensure_indexes
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+
+async def migrate(db, batch_size: int, keep_arrays: bool):
+    await ensure_indexes(db)
+
+    query = {"joined_communities.0": {"$exists": True}}
+    if keep_arrays:
+        # Nothing is unset, so every user with an array is visited once
+        query = {"joined_communities": {"$exists": True}}
+    total = await db.users.count_documents(query)
+    print(f"🔄 Migrating memberships for {total} users (batch size {batch_size})")
+
+    migrated_users = 0
+    migrated_edges = 0
+    start = time.perf_counter()
+    migrated_at = datetime.now(timezone.utc).isoformat()
+
+    cursor = db.users.find(query, {"_id": 1, "email": 1, "name": 1, "joined_communities": 1}).batch_size(batch_size)
+    batch = []
+    async for user in cursor:
+        batch.append(user)
+        if len(batch) >= batch_size:
+            migrated_edges += await migrate_batch(db, batch, keep_arrays, migrated_at)
+            migrated_users += len(batch)
+            batch = []
+            elapsed = time.perf_counter() - start
+            print(f"   {migrated_users}/{total} users, {migrated_edges} edges ({migrated_users / elapsed:.0f} users/s)")
+    if batch:
+        migrated_edges += await migrate_batch(db, batch, keep_arrays, migrated_at)
+        migrated_users += len(batch)
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ Migrated {migrated_users} users / {migrated_edges} memberships in {elapsed:.1f}s")
+
+
+async def migrate_batch(db, users, keep_arrays: bool, migrated_at: str) -> int:
+    operations = [
+        UpdateOne(
+            {"community_id": community_id, "user_email": user["email"]},
+            {"$setOnInsert": {"user_name": user.get("name"), "joined_at": migrated_at}},
+            upsert=True
+        )
+        for user in users
+        for community_id in set(user.get("joined_communities") or [])
+    ]
+    if operations:
+        await db.memberships.bulk_write(operations, ordered=False)
+    if not keep_arrays:
+        await db.users.update_many(
+            {"_id": {"$in": [user["_id"] for user in users]}},
+            {"$unset": {"joined_communities": ""}}
+        )
+    return len(operations)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Move users.joined_communities into the memberships collection")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--keep-arrays", action="store_true", help="don't unset joined_communities afterwards")
+    args = parser.parse_args()
+
+    mongo_url = os.getenv('MONGO_URL', 'mongodb://localhost:27017')
+    db_name = os.getenv('DB_NAME', 'biddge_db')
+    client = AsyncIOMotorClient(mongo_url)
+    try:
+        await migrate(client[db_name], args.batch_size, args.keep_arrays)
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
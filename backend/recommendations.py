@@ -0,0 +1,167 @@
+"""
+Item-to-item community recommendations from co-membership.
+
+Streams the memberships collection in (user_email, community_id) order,
+builds a sparse users x communities matrix for every batch of users and
+accumulates the community x community co-membership counts (X.T @ X), so
+memory is bounded by the co-membership matrix rather than the membership
+count. Similarity is cosine over member sets:
+
+    sim(a, b) = members(a & b) / sqrt(members(a) * members(b))
+
+Pairs sharing fewer than --min-co-members members are dropped as noise, and
+users in more than --max-user-communities communities only contribute their
+first ones (they say little about any pair and cost quadratically). The
+--top-n most similar communities of each community are written to
+community_neighbors; neighbor lists from an earlier run for communities
+that no longer have any are removed.
+
+GET /api/users/me/recommendations then only looks up the neighbor lists of
+the user's communities and merges them. The job is CPU heavy, so it runs as
+its own process rather than inside the API workers:
+
+    python recommendations.py                # compute once
+    python recommendations.py --every 3600   # recompute hourly (Procfile: recommender)
+"""
+import argparse
+import asyncio
+import os
+import time
+from array import array
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReplaceOne
+from scipy import sparse
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+
+def co_membership(rows: array, cols: array, users: int, communities: int) -> sparse.csr_matrix:
+    """X.T @ X for one batch of users, X being its users x communities membership matrix"""
+    data = np.ones(len(rows), dtype=np.int32)
+    matrix = sparse.csr_matrix(
+        (data, (np.frombuffer(rows, dtype=np.int32), np.frombuffer(cols, dtype=np.int32))),
+        shape=(users, communities)
+    )
+    return (matrix.T @ matrix).tocsr()
+
+
+async def co_membership_counts(db, columns: dict, batch_users: int = 50_000, max_user_communities: int = 500):
+    """Co-membership counts over all memberships, one batch of users at a time"""
+    total = sparse.csr_matrix((len(columns), len(columns)), dtype=np.int32)
+    rows, cols = array('i'), array('i')
+    user, row, joined = None, -1, 0
+
+    cursor = db.memberships.find({}, {"_id": 0, "user_email": 1, "community_id": 1}) \
+        .sort([("user_email", 1), ("community_id", 1)]).batch_size(10_000)
+    async for membership in cursor:
+        column = columns.get(membership["community_id"])
+        if column is None:
+            continue  # the community was deleted
+        if membership["user_email"] != user:
+            if row + 1 == batch_users:
+                total = total + co_membership(rows, cols, row + 1, len(columns))
+                rows, cols, row = array('i'), array('i'), -1
+            user, row, joined = membership["user_email"], row + 1, 0
+        if joined < max_user_communities:
+            rows.append(row)
+            cols.append(column)
+            joined += 1
+    if rows:
+        total = total + co_membership(rows, cols, row + 1, len(columns))
+    return total
+
+
+def nearest_neighbors(counts: sparse.csr_matrix, top_n: int = 20, min_co_members: int = 2):
+    """Yield (column, [(neighbor column, cosine similarity), ...]) best first"""
+    members = counts.diagonal()
+    counts = (counts - sparse.diags(members, dtype=counts.dtype)).tocsr()
+    counts.data[counts.data < min_co_members] = 0
+    counts.eliminate_zeros()
+
+    scale = sparse.diags(1 / np.sqrt(np.maximum(members, 1).astype(np.float64)))
+    similarity = (scale @ counts.astype(np.float64) @ scale).tocsr()
+    for column in range(similarity.shape[0]):
+        start, end = similarity.indptr[column], similarity.indptr[column + 1]
+        if start == end:
+            continue
+        scores = similarity.data[start:end]
+        neighbors = similarity.indices[start:end]
+        best = np.argpartition(-scores, top_n)[:top_n] if len(scores) > top_n else np.arange(len(scores))
+        best = best[np.argsort(-scores[best], kind="stable")]
+        yield column, list(zip(neighbors[best].tolist(), scores[best].round(6).tolist()))
+
+
+async def compute_neighbors(db, top_n: int = 20, batch_users: int = 50_000, max_user_communities: int = 500,
+                            min_co_members: int = 2, write_batch: int = 1000) -> int:
+    """Recompute community_neighbors; returns how many communities got a neighbor list"""
+    started = datetime.now(timezone.utc)
+    ids = [community["id"] async for community in db.communities.find({}, {"_id": 0, "id": 1})]
+    columns = {community_id: column for column, community_id in enumerate(ids)}
+
+    counts = await co_membership_counts(db, columns, batch_users, max_user_communities)
+
+    written = 0
+    operations = []
+    for column, neighbors in nearest_neighbors(counts, top_n, min_co_members):
+        operations.append(ReplaceOne(
+            {"community_id": ids[column]},
+            {
+                "community_id": ids[column],
+                "neighbors": [[ids[neighbor], score] for neighbor, score in neighbors],
+                "computed_at": started
+            },
+            upsert=True
+        ))
+        if len(operations) >= write_batch:
+            await db.community_neighbors.bulk_write(operations, ordered=False)
+            written += len(operations)
+            operations = []
+    if operations:
+        await db.community_neighbors.bulk_write(operations, ordered=False)
+        written += len(operations)
+
+    await db.community_neighbors.delete_many({"computed_at": {"$lt": started}})
+    return written
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top-n", type=int, default=20, help="neighbors kept per community")
+    parser.add_argument("--batch-users", type=int, default=50_000, help="users per sparse matrix batch")
+    parser.add_argument("--max-user-communities", type=int, default=500)
+    parser.add_argument("--min-co-members", type=int, default=2)
+    parser.add_argument("--every", type=float, default=0, help="seconds between runs (0: run once)")
+    args = parser.parse_args()
+
+    mongo_url = os.getenv('MONGO_URL', 'mongodb://localhost:27017')
+    db_name = os.getenv('DB_NAME', 'biddge_db')
+    client = AsyncIOMotorClient(mongo_url)
+    db = client[db_name]
+
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                written = await compute_neighbors(
+                    db, args.top_n, args.batch_users, args.max_user_communities, args.min_co_members
+                )
+                print(f"✅ Neighbors for {written} communities in {time.perf_counter() - start:.1f}s")
+            except Exception as e:
+                if not args.every:
+                    raise
+                print(f"❌ Recommendation run failed: {e}")
+            if not args.every:
+                break
+            await asyncio.sleep(args.every)
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
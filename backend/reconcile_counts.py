@@ -0,0 +1,105 @@
+"""
+Recompute communities.member_count from the memberships collection, and the
+category_stats rollup from communities.
+
+Repairs drift left behind by a crash with the member_count buffer enabled
+(or by anything else that changed counts without a membership edge). Counts
+are grouped from memberships in one aggregation and only communities whose
+stored count differs are rewritten, in batched unordered bulk_writes.
+
+Joins that land while this runs can make a count briefly wrong again, so run
+it in a quiet period (or just run it twice).
+
+    python reconcile_counts.py --dry-run   # report drift only
+    python reconcile_counts.py              # also rebuilds category_stats
+"""
+import argparse
+import asyncio
+import os
+from pathlib import Path
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+
+async def reconcile_member_counts(db, dry_run: bool = False, batch_size: int = 1000):
+    """Return a list of (community_id, stored, actual) for every community that drifted"""
+    actual = {}
+    pipeline = [{"$group": {"_id": "$community_id", "count": {"$sum": 1}}}]
+    async for row in db.memberships.aggregate(pipeline, allowDiskUse=True):
+        actual[row["_id"]] = row["count"]
+
+    drifted = []
+    operations = []
+    async for community in db.communities.find({}, {"_id": 0, "id": 1, "member_count": 1}):
+        stored = community.get("member_count", 0)
+        true_count = actual.get(community["id"], 0)
+        if stored == true_count:
+            continue
+        drifted.append((community["id"], stored, true_count))
+        if dry_run:
+            continue
+        operations.append(UpdateOne({"id": community["id"]}, {"$set": {"member_count": true_count}}))
+        if len(operations) >= batch_size:
+            await db.communities.bulk_write(operations, ordered=False)
+            operations = []
+    if operations:
+        await db.communities.bulk_write(operations, ordered=False)
+    return drifted
+
+
+async def rebuild_category_stats(db):
+    """
+    Recompute community_count and member_count per category from communities
+    and overwrite category_stats with the result. Returns the category count.
+    """
+    pipeline = [{"$group": {
+        "_id": {"$ifNull": ["$category", ""]},
+        "community_count": {"$sum": 1},
+        "member_count": {"$sum": {"$ifNull": ["$member_count", 0]}}
+    }}]
+    operations = []
+    categories = []
+    async for row in db.communities.aggregate(pipeline, allowDiskUse=True):
+        categories.append(row["_id"])
+        operations.append(UpdateOne(
+            {"category": row["_id"]},
+            {"$set": {"community_count": row["community_count"], "member_count": row["member_count"]}},
+            upsert=True
+        ))
+    if operations:
+        await db.category_stats.bulk_write(operations, ordered=False)
+    await db.category_stats.delete_many({"category": {"$nin": categories}})
+    return len(categories)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Recompute member_count from memberships")
+    parser.add_argument("--dry-run", action="store_true", help="report drift without writing")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    mongo_url = os.getenv('MONGO_URL', 'mongodb://localhost:27017')
+    db_name = os.getenv('DB_NAME', 'biddge_db')
+    client = AsyncIOMotorClient(mongo_url)
+    try:
+        drifted = await reconcile_member_counts(client[db_name], args.dry_run, args.batch_size)
+        for community_id, stored, true_count in drifted[:20]:
+            print(f"   {community_id}: {stored} -> {true_count}")
+        if len(drifted) > 20:
+            print(f"   ... and {len(drifted) - 20} more")
+        action = "would fix" if args.dry_run else "fixed"
+        print(f"✅ {len(drifted)} communities drifted ({action})")
+        if not args.dry_run:
+            categories = await rebuild_category_stats(client[db_name])
+            print(f"✅ Rebuilt category_stats for {categories} categories")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,132 @@
+"""
+Token revocation for stateless auth.
+
+Access tokens carry the user's name, creator flag and token version as signed
+claims (see token_claims in server.py), so with STATELESS_AUTH=1 requests are
+authorized without reading the user from Mongo. To revoke tokens, the user's
+token_version is bumped and a small document {email, min_version,
+updated_at, expires_at} is written to the revocations collection: every
+token for that email with a lower version is rejected. Revocations expire
+(TTL index) once every token they could apply to has expired.
+
+Each worker keeps the revocations in memory (a dict of email -> min_version)
+and fetches new ones every refresh interval, so a revocation made on another
+worker applies within one interval.
+
+    python revocations.py user@example.com   # sign a user out everywhere
+"""
+import argparse
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+logger = logging.getLogger(__name__)
+
+
+async def revoke_user_tokens(db, email: str, token_lifetime: timedelta):
+    """
+    Invalidate every token issued to email so far. Returns the new token
+    version (tokens issued from now on carry it), or None for an unknown user.
+    """
+    user = await db.users.find_one_and_update(
+        {"email": email},
+        {"$inc": {"token_version": 1}},
+        projection={"token_version": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    if user is None:
+        return None
+    now = datetime.now(timezone.utc)
+    await db.revocations.update_one(
+        {"email": email},
+        {"$set": {"min_version": user["token_version"], "updated_at": now, "expires_at": now + token_lifetime}},
+        upsert=True
+    )
+    return user["token_version"]
+
+
+class RevocationSet:
+    def __init__(self, collection, interval: float = 30.0):
+        self.collection = collection
+        self.interval = interval
+        self._min_version = {}  # email -> (min_version, expires_at)
+        self._since = None
+        self._task = None
+
+    def __len__(self):
+        return len(self._min_version)
+
+    def is_revoked(self, email: str, version: int) -> bool:
+        entry = self._min_version.get(email)
+        return entry is not None and version < entry[0]
+
+    def add(self, email: str, min_version: int, expires_at: datetime):
+        current = self._min_version.get(email)
+        if current is None or min_version > current[0]:
+            self._min_version[email] = (min_version, expires_at)
+
+    async def refresh(self):
+        """Fetch revocations written since the last refresh and drop expired ones"""
+        # $gte: a revocation written in the same millisecond as the last one seen is not missed
+        query = {"updated_at": {"$gte": self._since}} if self._since else {}
+        cursor = self.collection.find(query, {"_id": 0}).sort("updated_at", 1)
+        async for doc in cursor:
+            self.add(doc["email"], doc["min_version"], doc["expires_at"])
+            self._since = doc["updated_at"]
+
+        now = datetime.now(timezone.utc)
+        for email, (_, expires_at) in list(self._min_version.items()):
+            if expires_at.replace(tzinfo=expires_at.tzinfo or timezone.utc) <= now:
+                del self._min_version[email]
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Revocation refresh failed, will retry")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("emails", nargs="+")
+    parser.add_argument("--token-days", type=float, default=7, help="access token lifetime")
+    args = parser.parse_args()
+
+    mongo_url = os.getenv('MONGO_URL', 'mongodb://localhost:27017')
+    db_name = os.getenv('DB_NAME', 'biddge_db')
+    client = AsyncIOMotorClient(mongo_url)
+    db = client[db_name]
+
+    try:
+        for email in args.emails:
+            version = await revoke_user_tokens(db, email, timedelta(days=args.token_days))
+            if version is None:
+                print(f"⚠️ No user {email}")
+            else:
+                print(f"✅ Revoked tokens for {email} (now at version {version})")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
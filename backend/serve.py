@@ -0,0 +1,78 @@
+"""
+Production entry point for the API server.
+
+    python serve.py
+    WEB_CONCURRENCY=4 KEEP_ALIVE=75 python serve.py
+
+Runs uvicorn with one worker process per available CPU (or WEB_CONCURRENCY),
+uvloop and httptools from uvicorn[standard], no reloader, and no access log
+(RequestTimingMiddleware already logs requests). On SIGTERM each worker stops
+accepting connections, gives in-flight requests up to GRACEFUL_TIMEOUT
+seconds, then runs the shutdown hooks that flush counter buffers and close
+Mongo.
+
+Every worker is a separate process with its own caches, counter buffers,
+password pool and Mongo connection pool, so MONGO_MAX_POOL_SIZE and
+PASSWORD_POOL_WORKERS are per worker.
+
+For development, `python server.py` still runs a single reloading process.
+
+Settings (env):
+  HOST, PORT                 bind address (0.0.0.0:8000)
+  WEB_CONCURRENCY            worker processes (available CPUs)
+  KEEP_ALIVE                 seconds an idle keep-alive connection stays open (5);
+                             set it above the load balancer's idle timeout
+  GRACEFUL_TIMEOUT           seconds to drain requests on shutdown (30)
+  BACKLOG                    listen backlog (2048)
+  UVICORN_LOOP, UVICORN_HTTP event loop and HTTP parser (uvloop, httptools)
+  FORWARDED_ALLOW_IPS        comma-separated proxy addresses (or *) whose
+                             X-Forwarded-For/-Proto are trusted (127.0.0.1).
+                             Behind a load balancer or PaaS router set it to
+                             the router's addresses, or * when only the router
+                             can reach the app: otherwise every request comes
+                             from the router's IP and all clients share one
+                             AUTH_IP_RATE bucket.
+"""
+import math
+import os
+from pathlib import Path
+
+import uvicorn
+
+
+def available_cpus() -> int:
+    """CPUs this process may use: the affinity mask, capped by a cgroup v2 CPU quota"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def main():
+    workers = int(os.environ.get('WEB_CONCURRENCY', '0')) or available_cpus()
+    uvicorn.run(
+        "server:app",
+        host=os.environ.get('HOST', '0.0.0.0'),
+        port=int(os.environ.get('PORT', '8000')),
+        workers=workers,
+        loop=os.environ.get('UVICORN_LOOP', 'uvloop'),
+        http=os.environ.get('UVICORN_HTTP', 'httptools'),
+        timeout_keep_alive=int(os.environ.get('KEEP_ALIVE', '5')),
+        timeout_graceful_shutdown=int(os.environ.get('GRACEFUL_TIMEOUT', '30')),
+        backlog=int(os.environ.get('BACKLOG', '2048')),
+        proxy_headers=True,
+        forwarded_allow_ips=os.environ.get('FORWARDED_ALLOW_IPS', '127.0.0.1'),
+        access_log=False,
+        log_level=os.environ.get('LOG_LEVEL', 'info').lower(),
+    )
+
+
+if __name__ == "__main__":
+    main()
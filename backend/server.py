@@ -1,5 +1,6 @@
 # FORCE DEPLOY - February 12, 2026 - 2:30 PM
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Query, Request, status
+from fastapi.responses import ORJSONResponse, PlainTextResponse, Response, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
@@ -10,24 +11,92 @@ from pathlib import Path
 from pydantic import BaseModel, Field, EmailStr, ConfigDict
 from typing import List, Optional
 from datetime import datetime, timezone, timedelta
-from passlib.context import CryptContext
 import jwt
+from pymongo import ReadPreference
+from pymongo.errors import DuplicateKeyError
+from bson import ObjectId
 import uuid
+import json
+import base64
+import math
+import hashlib
+import heapq
+import asyncio
+import random
+import orjson
+
+from cache import TTLCache, invalidate_on_change
+from passwords import PasswordPool, PoolSaturated
+from indexes import ensure_indexes
+from counters import CounterBuffer
+from reconcile_counts import rebuild_category_stats
+from bulk_load import load_seed_communities
+from revocations import RevocationSet, revoke_user_tokens
+from admission import ConcurrencyLimiter, Overloaded, RateLimiter
+from live_counts import CountBroadcaster, ensure_events_collection
+from trending import TrendingBoard
+from membership_events import EventWriter
+from telemetry import configure_logging, DatabaseTimer, Metrics, PoolStats, RequestTimingMiddleware
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+# Logging: records go through a queue to a background writer (see telemetry.py)
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'text')  # text | json
+# Fraction of fast, successful requests that get a timing log line; errors and slow requests always do
+LOG_SAMPLE_RATE = float(os.environ.get('LOG_SAMPLE_RATE', '1.0'))
+LOG_SLOW_MS = float(os.environ.get('LOG_SLOW_MS', '500'))
+
+log_listener = configure_logging(LOG_LEVEL, LOG_FORMAT)
+logger = logging.getLogger(__name__)
+
+# Per-worker metrics served at GET /metrics
+metrics = Metrics()
+pool_stats = PoolStats()
+metrics.add_collector(pool_stats.samples)
+
 # MongoDB connection
 mongo_url = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
 db_name = os.environ.get('DB_NAME', 'biddge_db')
 
-print(f"🔄 Connecting to MongoDB: {mongo_url}")
-print(f"📊 Using database: {db_name}")
+# Connection pool (per worker process) and timeouts. MONGO_MIN_POOL_SIZE
+# connections are opened in the background after startup so early requests
+# don't pay for the handshake. A short server selection timeout makes
+# requests fail fast instead of hanging for pymongo's default 30s when Mongo
+# is unreachable.
+MONGO_MAX_POOL_SIZE = int(os.environ.get('MONGO_MAX_POOL_SIZE', '100'))
+MONGO_MIN_POOL_SIZE = int(os.environ.get('MONGO_MIN_POOL_SIZE', '0'))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', '5000'))
+MONGO_CONNECT_TIMEOUT_MS = int(os.environ.get('MONGO_CONNECT_TIMEOUT_MS', '5000'))
 
-client = AsyncIOMotorClient(mongo_url)
+# Read preference for listing reads (lists, featured, categories, search,
+# batch). secondaryPreferred moves them off the primary of a replica set, at
+# the cost of replication lag: a list cached just after a join may briefly
+# show the old member_count. Single-community reads and writes stay on the primary.
+READ_PREFERENCES = {
+    "primary": ReadPreference.PRIMARY,
+    "primaryPreferred": ReadPreference.PRIMARY_PREFERRED,
+    "secondary": ReadPreference.SECONDARY,
+    "secondaryPreferred": ReadPreference.SECONDARY_PREFERRED,
+    "nearest": ReadPreference.NEAREST,
+}
+MONGO_LISTING_READ_PREFERENCE = READ_PREFERENCES[os.environ.get('MONGO_LISTING_READ_PREFERENCE', 'primary')]
+
+logger.info("Connecting to MongoDB", extra={"database": db_name})
+
+client = AsyncIOMotorClient(
+    mongo_url,
+    maxPoolSize=MONGO_MAX_POOL_SIZE,
+    minPoolSize=MONGO_MIN_POOL_SIZE,
+    serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+    event_listeners=[DatabaseTimer(metrics), pool_stats]
+)
 db = client[db_name]
 
-app = FastAPI(title="Biddge API", version="1.0.0")
+# orjson for every response; hot list endpoints go further and cache encoded bodies
+app = FastAPI(title="Biddge API", version="1.0.0", default_response_class=ORJSONResponse)
 api_router = APIRouter(prefix="/api")
 
 # JWT Configuration
@@ -35,16 +104,228 @@ SECRET_KEY = os.environ.get('JWT_SECRET', 'your-secret-key-change-in-production'
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Community listing pagination
+COMMUNITY_PAGE_DEFAULT = 50
+COMMUNITY_PAGE_MAX = 200
+COMMUNITY_SORT = [("created_at", 1), ("id", 1)]
+# Most communities returned by /communities/batch and /users/me?expand=communities
+COMMUNITY_BATCH_MAX = int(os.environ.get('COMMUNITY_BATCH_MAX', '100'))
+
+# In-process cache for community list/featured reads. Cleared by writes in this
+# worker; set COMMUNITY_CACHE_CHANGE_STREAM=1 (replica set only) to also clear
+# it when other workers write.
+COMMUNITY_CACHE_TTL = float(os.environ.get('COMMUNITY_CACHE_TTL', '30'))
+COMMUNITY_CACHE_SIZE = int(os.environ.get('COMMUNITY_CACHE_SIZE', '128'))
+COMMUNITY_CACHE_MAX_DOCS = int(os.environ.get('COMMUNITY_CACHE_MAX_DOCS', '5000'))
+COMMUNITY_CACHE_CHANGE_STREAM = os.environ.get('COMMUNITY_CACHE_CHANGE_STREAM', '0') == '1'
+
+community_cache = TTLCache(maxsize=COMMUNITY_CACHE_SIZE, ttl=COMMUNITY_CACHE_TTL)
+
+# Search result pages get their own cache: queries are open-ended, and sharing
+# community_cache would let them evict the list/featured bodies. Same TTL and
+# invalidation as community_cache; SEARCH_CACHE_SIZE=0 disables it.
+SEARCH_CACHE_SIZE = int(os.environ.get('SEARCH_CACHE_SIZE', '256'))
+search_cache = TTLCache(maxsize=SEARCH_CACHE_SIZE, ttl=COMMUNITY_CACHE_TTL)
+
+# Single-community bodies (GET /communities/{id}), kept apart for the same
+# reason: browsing detail pages must not evict the list bodies.
+COMMUNITY_DETAIL_CACHE_SIZE = int(os.environ.get('COMMUNITY_DETAIL_CACHE_SIZE', '1024'))
+community_detail_cache = TTLCache(maxsize=COMMUNITY_DETAIL_CACHE_SIZE, ttl=COMMUNITY_CACHE_TTL)
+
+# Cache-Control for public community reads. Browsers revalidate every time
+# (a cheap 304 while the ETag matches); shared caches may serve a copy for a
+# few seconds.
+COMMUNITY_HTTP_CACHE_CONTROL = os.environ.get('COMMUNITY_HTTP_CACHE_CONTROL', 'public, max-age=0, s-maxage=10')
+
+# Authenticated-user caches: decoded token -> email, and email -> projected
+# user record. Membership lives in its own collection, so join/leave don't
+# touch these.
+USER_CACHE_TTL = float(os.environ.get('USER_CACHE_TTL', '60'))
+USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', '10000'))
+USER_PROJECTION = {"_id": 0, "name": 1, "email": 1, "is_creator": 1}
+
+token_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+user_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+
+# Tokens carry name, is_creator and token version as signed claims. With
+# STATELESS_AUTH=1 those claims are trusted and authenticated requests skip
+# the users lookup entirely; revoked tokens are caught by the in-memory
+# revocation set (see revocations.py), refreshed every REVOCATION_REFRESH_INTERVAL
+# seconds. Tokens issued before claims existed still go through the lookup.
+STATELESS_AUTH = os.environ.get('STATELESS_AUTH', '0') == '1'
+REVOCATION_REFRESH_INTERVAL = float(os.environ.get('REVOCATION_REFRESH_INTERVAL', '30'))
+
+revoked_tokens = None  # RevocationSet, created at startup
+
+# Wrap join/leave user + community updates in a multi-document transaction
+# (requires a replica set). Off by default: the unique membership index already
+# keeps member_count exact without one.
+MEMBERSHIP_TRANSACTIONS = os.environ.get('MEMBERSHIP_TRANSACTIONS', '0') == '1'
+
+# Run migrate_memberships.py before deploying: memberships are read from the
+# memberships collection only. To deploy first and migrate afterwards, set
+# LEGACY_MEMBERSHIP_ARRAYS=1 until the migration is done: membership reads then
+# also include the old users.joined_communities arrays (one more read by email),
+# joins check the array (one more round trip) and move a membership found
+# there into memberships, and leaves fall back to the array when there was no
+# edge to delete. Not for arrays kept with --keep-arrays, which leaves don't clear.
+LEGACY_MEMBERSHIP_ARRAYS = os.environ.get('LEGACY_MEMBERSHIP_ARRAYS', '0') == '1'
+
+# Coalesce member_count increments in memory and flush them in one bulk_write
+# per interval (see counters.py). member_count then lags by up to one interval.
+MEMBER_COUNT_BUFFER = os.environ.get('MEMBER_COUNT_BUFFER', '0') == '1'
+MEMBER_COUNT_FLUSH_INTERVAL = float(os.environ.get('MEMBER_COUNT_FLUSH_INTERVAL', '1.0'))
+MEMBER_COUNT_MAX_PENDING = int(os.environ.get('MEMBER_COUNT_MAX_PENDING', '1000'))
+
+member_counts = None  # CounterBuffer, created at startup when MEMBER_COUNT_BUFFER=1
+
+# Live member_count deltas for GET /communities/live (see live_counts.py).
+# Changes are coalesced and sent every LIVE_COUNTS_TICK seconds; a client that
+# falls LIVE_COUNTS_QUEUE events behind is disconnected. With
+# LIVE_COUNTS_SHARED=1 workers exchange deltas through a capped collection of
+# LIVE_COUNTS_EVENTS_BYTES.
+LIVE_COUNTS_TICK = float(os.environ.get('LIVE_COUNTS_TICK', '1.0'))
+LIVE_COUNTS_QUEUE = int(os.environ.get('LIVE_COUNTS_QUEUE', '16'))
+LIVE_COUNTS_MAX_SUBSCRIBERS = int(os.environ.get('LIVE_COUNTS_MAX_SUBSCRIBERS', '10000'))
+LIVE_COUNTS_KEEPALIVE = float(os.environ.get('LIVE_COUNTS_KEEPALIVE', '15'))
+LIVE_COUNTS_RETRY_MS = int(os.environ.get('LIVE_COUNTS_RETRY_MS', '3000'))
+LIVE_COUNTS_SHARED = os.environ.get('LIVE_COUNTS_SHARED', '1') == '1'
+LIVE_COUNTS_EVENTS_BYTES = int(os.environ.get('LIVE_COUNTS_EVENTS_BYTES', str(1024 * 1024)))
+
+live_counts = None  # CountBroadcaster, created at startup
+
+# /communities/featured ranks communities by trending score: net joins, each
+# decaying with a TRENDING_HALF_LIFE_HOURS half-life (see trending.py). Fed
+# from the live count ticks and snapshotted to the leaderboards collection
+# every TRENDING_SNAPSHOT_INTERVAL seconds.
+FEATURED_COUNT = 6
+TRENDING_HALF_LIFE_HOURS = float(os.environ.get('TRENDING_HALF_LIFE_HOURS', '6'))
+TRENDING_SNAPSHOT_INTERVAL = float(os.environ.get('TRENDING_SNAPSHOT_INTERVAL', '60'))
+
+trending = None  # TrendingBoard, created at startup
+
+# GET /users/me/recommendations merges the precomputed neighbor lists of the
+# user's communities (written by recommendations.py, run as its own process).
+# Lists are cached per community; the job rewrites them at most hourly.
+RECOMMENDATIONS_DEFAULT = 10
+RECOMMENDATIONS_MAX = 50
+NEIGHBOR_CACHE_TTL = float(os.environ.get('NEIGHBOR_CACHE_TTL', '300'))
+
+neighbor_cache = TTLCache(maxsize=10000, ttl=NEIGHBOR_CACHE_TTL)
+
+# Join/leave events for creator analytics (see membership_events.py): appended
+# to membership_events and rolled up into membership_daily, in one batch per
+# flush interval. GET /creators/me/stats reads only the rollups.
+MEMBERSHIP_EVENTS = os.environ.get('MEMBERSHIP_EVENTS', '1') == '1'
+CREATOR_STATS_DAYS_DEFAULT = 30
+CREATOR_STATS_DAYS_MAX = 365
+
+membership_events = None  # EventWriter, created at startup when MEMBERSHIP_EVENTS=1
+
+# Per-category totals for GET /categories live in category_stats and are kept
+# up to date incrementally: create_community bumps community_count directly,
+# join/leave member deltas go through a CounterBuffer flushed every interval.
+category_counts = None  # CounterBuffer, created at startup
+CATEGORY_LIMIT = 500
+known_communities = TTLCache(maxsize=10000, ttl=COMMUNITY_CACHE_TTL)
+
+# bcrypt runs in a bounded pool; auth requests get 503 once it is saturated
+password_pool = PasswordPool(
+    kind=os.environ.get('PASSWORD_POOL_KIND', 'thread'),
+    workers=int(os.environ.get('PASSWORD_POOL_WORKERS', '0')) or None,
+    max_pending=int(os.environ.get('PASSWORD_POOL_MAX_PENDING', '0')) or None
+)
+PASSWORD_POOL_RETRY_AFTER = os.environ.get('PASSWORD_POOL_RETRY_AFTER', '1')
+
+# /readyz pings Mongo at most once per READINESS_CACHE_TTL seconds and gives
+# up after READINESS_TIMEOUT; /debug/db statistics are cached for DEBUG_STATS_TTL
+READINESS_CACHE_TTL = float(os.environ.get('READINESS_CACHE_TTL', '2'))
+READINESS_TIMEOUT = float(os.environ.get('READINESS_TIMEOUT', '1'))
+DEBUG_STATS_TTL = float(os.environ.get('DEBUG_STATS_TTL', '30'))
+
+readiness_cache = TTLCache(maxsize=1, ttl=READINESS_CACHE_TTL)
+readiness_check = None  # in-flight ping shared by concurrent probes
+debug_cache = TTLCache(maxsize=1, ttl=DEBUG_STATS_TTL)
+
+# Admission control (see admission.py): at most *_CONCURRENCY requests of a
+# route group run at once; the rest queue (up to *_QUEUE) and get a 503 if no
+# slot frees up within *_MAX_WAIT seconds
+ADMISSION_AUTH_CONCURRENCY = int(os.environ.get('ADMISSION_AUTH_CONCURRENCY', '32'))
+ADMISSION_AUTH_QUEUE = int(os.environ.get('ADMISSION_AUTH_QUEUE', '64'))
+ADMISSION_AUTH_MAX_WAIT = float(os.environ.get('ADMISSION_AUTH_MAX_WAIT', '2'))
+ADMISSION_WRITE_CONCURRENCY = int(os.environ.get('ADMISSION_WRITE_CONCURRENCY', '64'))
+ADMISSION_WRITE_QUEUE = int(os.environ.get('ADMISSION_WRITE_QUEUE', '512'))
+ADMISSION_WRITE_MAX_WAIT = float(os.environ.get('ADMISSION_WRITE_MAX_WAIT', '1'))
+ADMISSION_RETRY_AFTER = os.environ.get('ADMISSION_RETRY_AFTER', '1')
+
+admission_limiters = {
+    "auth": ConcurrencyLimiter("auth", ADMISSION_AUTH_CONCURRENCY, ADMISSION_AUTH_QUEUE, ADMISSION_AUTH_MAX_WAIT),
+    "writes": ConcurrencyLimiter("writes", ADMISSION_WRITE_CONCURRENCY, ADMISSION_WRITE_QUEUE, ADMISSION_WRITE_MAX_WAIT),
+}
+
+# Token buckets on login/register: burst, then tokens per second (0 disables).
+# The per-IP bucket keys on the client address uvicorn reports: behind a proxy
+# set FORWARDED_ALLOW_IPS (see serve.py), or every client shares the proxy's.
+AUTH_IP_RATE = float(os.environ.get('AUTH_IP_RATE', '1'))
+AUTH_IP_BURST = int(os.environ.get('AUTH_IP_BURST', '20'))
+AUTH_ACCOUNT_RATE = float(os.environ.get('AUTH_ACCOUNT_RATE', '0.1'))
+AUTH_ACCOUNT_BURST = int(os.environ.get('AUTH_ACCOUNT_BURST', '5'))
+
+auth_ip_limiter = RateLimiter("auth_ip", AUTH_IP_RATE, AUTH_IP_BURST)
+auth_account_limiter = RateLimiter("auth_account", AUTH_ACCOUNT_RATE, AUTH_ACCOUNT_BURST)
+
 security = HTTPBearer()
 
 # ============ Helper Functions ============
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+async def run_password_job(job, *args):
+    try:
+        return await job(*args)
+    except PoolSaturated:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many authentication requests, please retry",
+            headers={"Retry-After": PASSWORD_POOL_RETRY_AFTER}
+        )
+
+def admission(group: str):
+    """Dependency holding a slot in the group's ConcurrencyLimiter for the whole request"""
+    limiter = admission_limiters[group]
+    
+    async def admit():
+        try:
+            await limiter.acquire()
+        except Overloaded:
+            raise HTTPException(
+                status_code=503,
+                detail="Server is busy, please retry shortly",
+                headers={"Retry-After": ADMISSION_RETRY_AFTER}
+            )
+        try:
+            yield
+        finally:
+            limiter.release()
+    
+    return admit
+
+def rate_limit(limiter: RateLimiter, key: str):
+    wait = limiter.check(key)
+    if wait:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many attempts, please slow down",
+            headers={"Retry-After": str(math.ceil(wait))}
+        )
+
+async def auth_ip_rate_limit(request: Request):
+    """Per client address token bucket, checked before queueing for an auth slot"""
+    rate_limit(auth_ip_limiter, request.client.host if request.client else "unknown")
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+async def hash_password(password: str) -> str:
+    return await run_password_job(password_pool.hash, password)
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await run_password_job(password_pool.verify, plain_password, hashed_password)
 
 def create_access_token(data: dict):
     to_encode = data.copy()
@@ -53,23 +334,244 @@ def create_access_token(data: dict):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def token_claims(user: dict) -> dict:
+    """Signed claims for a user's access token"""
+    return {
+        "sub": user["email"],
+        "name": user["name"],
+        "creator": user.get("is_creator", False),
+        "ver": user.get("token_version", 0)
+    }
+
+def decode_token(token: str) -> dict:
+    """Return the token's claims, caching the verified decode until expiry"""
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    if payload.get("sub") is None:
+        raise HTTPException(status_code=401, detail="Invalid authentication credentials")
+    token_cache.set(token, payload, ttl=payload["exp"] - datetime.now(timezone.utc).timestamp())
+    return payload
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     token = credentials.credentials
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise HTTPException(status_code=401, detail="Invalid authentication credentials")
-        user = await db.users.find_one({"email": email})
-        if user is None:
-            raise HTTPException(status_code=401, detail="User not found")
-        # Convert ObjectId to string
-        user["_id"] = str(user["_id"])
-        return user
+        claims = decode_token(token)
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token has expired")
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
+    
+    email = claims["sub"]
+    if revoked_tokens is not None and revoked_tokens.is_revoked(email, claims.get("ver", 0)):
+        raise HTTPException(status_code=401, detail="Token has been revoked")
+    if STATELESS_AUTH and "name" in claims:
+        return {"name": claims["name"], "email": email, "is_creator": claims.get("creator", False)}
+    
+    user = user_cache.get(email)
+    if user is None:
+        user = await db.users.find_one({"email": email}, USER_PROJECTION)
+        if user is None:
+            raise HTTPException(status_code=401, detail="User not found")
+        user_cache.set(email, user)
+    return user
+
+def encode_cursor(*values) -> str:
+    """Opaque keyset cursor from the sort-key values of the last item on a page"""
+    raw = json.dumps(list(values)).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str, size: int, kind: type = str) -> list:
+    """
+    Sort-key values from a cursor made by encode_cursor. Every value must be
+    a `kind`: the values go straight into Mongo filters, so anything else
+    (e.g. an {"$ne": null} object) is rejected rather than queried with.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        values = None
+    if (not isinstance(values, list) or len(values) != size
+            or not all(type(value) is kind for value in values)):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+def community_cursor(community: dict) -> str:
+    return encode_cursor(community.get("created_at"), community.get("id"))
+
+def cursor_filter(cursor: str) -> dict:
+    """Turn a community cursor back into a (created_at, id) keyset filter"""
+    created_at, community_id = decode_cursor(cursor, 2)
+    return {
+        "$or": [
+            {"created_at": {"$gt": created_at}},
+            {"created_at": created_at, "id": {"$gt": community_id}}
+        ]
+    }
+
+MEDIA_TYPES = {"json": "application/json", "ndjson": "application/x-ndjson"}
+
+def encode_json(value) -> bytes:
+    """orjson, falling back to str() for types it doesn't know (e.g. ObjectId)"""
+    return orjson.dumps(value, default=str)
+
+def encode_ndjson(docs) -> bytes:
+    return b"".join(encode_json(doc) + b"\n" for doc in docs)
+
+def body_etag(body: bytes) -> str:
+    """Strong ETag from the encoded body, so every worker agrees on it"""
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison: W/"x" matches "x"
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+def cache_body(key, body: bytes, generation: int, headers: Optional[dict] = None,
+               cache: TTLCache = community_cache) -> tuple:
+    """Store an encoded body with its ETag (and any extra headers) in cache"""
+    entry = (body_etag(body), body, headers or {})
+    cache.set(key, entry, generation=generation)
+    return entry
+
+def body_response(request: Request, entry: tuple, format: str = "json") -> Response:
+    """200 with the body, or 304 if the client already has this ETag"""
+    etag, body, extra = entry
+    headers = {"ETag": etag, "Cache-Control": COMMUNITY_HTTP_CACHE_CONTROL, **extra}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type=MEDIA_TYPES[format], headers=headers)
+
+def cached_body(request: Request, key, format: str = "json", cache: TTLCache = community_cache) -> Optional[Response]:
+    """
+    Response for a cached pre-encoded body, or None on a miss. A matching
+    If-None-Match is answered from the cache without touching Mongo.
+    """
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    return body_response(request, entry, format)
+
+async def stream_documents(cursor, format: str, key):
+    """
+    Encode documents as a JSON array (or one per line for ndjson) while the
+    Motor cursor yields them, and store the finished body in community_cache
+    so later requests skip both the query and the encoding. Nothing is stored
+    if the result grew past COMMUNITY_CACHE_MAX_DOCS or a write invalidated
+    the cache meanwhile. The ETag is only known once the body is complete,
+    so it is sent from the first cached response onwards.
+    """
+    generation = community_cache.generation
+    ndjson = format == "ndjson"
+    chunks = [] if ndjson else [b"["]
+    if not ndjson:
+        yield b"["
+    count = 0
+    async for doc in cursor:
+        if ndjson:
+            chunk = encode_json(doc) + b"\n"
+        else:
+            chunk = (b"," if count else b"") + encode_json(doc)
+        count += 1
+        if chunks is not None:
+            chunks.append(chunk)
+            if count > COMMUNITY_CACHE_MAX_DOCS:
+                chunks = None
+        yield chunk
+    if not ndjson:
+        yield b"]"
+    if chunks is not None:
+        if not ndjson:
+            chunks.append(b"]")
+        cache_body(key, b"".join(chunks), generation)
+
+def listing(collection: str):
+    """Collection handle for listing reads, honouring MONGO_LISTING_READ_PREFERENCE"""
+    if MONGO_LISTING_READ_PREFERENCE == ReadPreference.PRIMARY:
+        return db[collection]
+    return db[collection].with_options(read_preference=MONGO_LISTING_READ_PREFERENCE)
+
+def invalidate_community_cache():
+    community_cache.clear()
+    search_cache.clear()
+    community_detail_cache.clear()
+
+async def legacy_community_ids(user_email: str) -> List[str]:
+    """Memberships still only in users.joined_communities (none unless LEGACY_MEMBERSHIP_ARRAYS=1)"""
+    if not LEGACY_MEMBERSHIP_ARRAYS:
+        return []
+    user = await db.users.find_one({"email": user_email}, {"_id": 0, "joined_communities": 1})
+    return (user or {}).get("joined_communities") or []
+
+async def joined_community_ids(user_email: str) -> List[str]:
+    """IDs of every community the user belongs to (covered by the user_email index)"""
+    cursor = db.memberships.find({"user_email": user_email}, {"_id": 0, "community_id": 1})
+    ids = [membership["community_id"] async for membership in cursor]
+    known = set(ids)
+    for community_id in await legacy_community_ids(user_email):
+        if community_id not in known:
+            known.add(community_id)
+            ids.append(community_id)
+    return ids
+
+async def community_neighbors(community_ids: List[str]) -> dict:
+    """Precomputed [[neighbor id, similarity], ...] per community (cached, [] when none)"""
+    neighbors = {}
+    missing = []
+    for community_id in community_ids:
+        cached = neighbor_cache.get(community_id)
+        if cached is None:
+            missing.append(community_id)
+        else:
+            neighbors[community_id] = cached
+    if missing:
+        cursor = listing("community_neighbors").find(
+            {"community_id": {"$in": missing}}, {"_id": 0, "community_id": 1, "neighbors": 1}
+        )
+        async for doc in cursor:
+            neighbors[doc["community_id"]] = doc["neighbors"]
+        for community_id in missing:
+            neighbor_cache.set(community_id, neighbors.setdefault(community_id, []))
+    return neighbors
+
+async def joined_communities_expanded(user_email: str) -> List[dict]:
+    """The user's communities in one round trip: memberships joined to communities with $lookup"""
+    pipeline = [
+        {"$match": {"user_email": user_email}},
+        {"$sort": {"community_id": 1}},
+        {"$limit": COMMUNITY_BATCH_MAX},
+        {"$lookup": {"from": "communities", "localField": "community_id", "foreignField": "id", "as": "community"}},
+        # Drops memberships whose community no longer exists
+        {"$unwind": "$community"},
+        {"$replaceRoot": {"newRoot": "$community"}},
+        {"$project": {"_id": 0}}
+    ]
+    communities = await db.memberships.aggregate(pipeline).to_list(length=COMMUNITY_BATCH_MAX)
+    legacy = set(await legacy_community_ids(user_email)) - {community["id"] for community in communities}
+    if legacy:
+        cursor = db.communities.find({"id": {"$in": list(legacy)}}, {"_id": 0})
+        communities += await cursor.to_list(length=len(legacy))
+        communities = sorted(communities, key=lambda community: community["id"])[:COMMUNITY_BATCH_MAX]
+    return communities
+
+async def membership_page(query: dict, key: str, limit: int, cursor: Optional[str]) -> dict:
+    """One keyset page of memberships matching query, ordered by key"""
+    if cursor:
+        (after,) = decode_cursor(cursor, 1)
+        query = {**query, key: {"$gt": after}}
+    mongo_cursor = db.memberships.find(query, {"_id": 0}).sort(key, 1).limit(limit + 1)
+    memberships = await mongo_cursor.to_list(length=limit + 1)
+    next_cursor = None
+    if len(memberships) > limit:
+        memberships = memberships[:limit]
+        next_cursor = encode_cursor(memberships[-1][key])
+    return {"items": memberships, "next_cursor": next_cursor}
 
 # ============ Pydantic Models ============
 
@@ -113,28 +615,33 @@ class Community(BaseModel):
 
 # ============ Auth Endpoints ============
 
-@api_router.post("/auth/register", response_model=UserResponse)
+@api_router.post(
+    "/auth/register",
+    response_model=UserResponse,
+    dependencies=[Depends(auth_ip_rate_limit), Depends(admission("auth"))]
+)
 async def register(user_input: UserRegister):
+    rate_limit(auth_account_limiter, user_input.email.lower())
+    
     # Check if user already exists
     existing_user = await db.users.find_one({"email": user_input.email})
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     
     # Hash password and create user document
-    hashed_pw = hash_password(user_input.password)
+    hashed_pw = await hash_password(user_input.password)
     user_doc = {
         "name": user_input.name,
         "email": user_input.email,
         "password": hashed_pw,
         "is_creator": user_input.is_creator,
-        "joined_communities": [],
         "created_at": datetime.now(timezone.utc).isoformat()
     }
     
     await db.users.insert_one(user_doc)
     
     # Create access token
-    token = create_access_token({"sub": user_input.email})
+    token = create_access_token(token_claims(user_doc))
     
     return UserResponse(
         name=user_input.name,
@@ -144,114 +651,348 @@ async def register(user_input: UserRegister):
         token=token
     )
 
-@api_router.post("/auth/login", response_model=UserResponse)
+@api_router.post(
+    "/auth/login",
+    response_model=UserResponse,
+    dependencies=[Depends(auth_ip_rate_limit), Depends(admission("auth"))]
+)
 async def login(user_input: UserLogin):
+    rate_limit(auth_account_limiter, user_input.email.lower())
+    
     # Find user
     user = await db.users.find_one({"email": user_input.email})
-    if not user or not verify_password(user_input.password, user["password"]):
+    if not user or not await verify_password(user_input.password, user["password"]):
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
     # Create access token
-    token = create_access_token({"sub": user_input.email})
+    token = create_access_token(token_claims(user))
     
     return UserResponse(
         name=user["name"],
         email=user["email"],
         is_creator=user.get("is_creator", False),
-        joined_communities=user.get("joined_communities", []),
+        joined_communities=await joined_community_ids(user["email"]),
         token=token
     )
 
+@api_router.post("/auth/revoke")
+async def revoke_tokens(current_user: dict = Depends(get_current_user)):
+    """
+    Sign out everywhere: every token issued to the current user so far stops
+    working (on other workers within REVOCATION_REFRESH_INTERVAL)
+    """
+    token_lifetime = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    version = await revoke_user_tokens(db, current_user["email"], token_lifetime)
+    if version is None:
+        raise HTTPException(status_code=401, detail="User not found")
+    if revoked_tokens is not None:
+        revoked_tokens.add(current_user["email"], version, datetime.now(timezone.utc) + token_lifetime)
+    return {"message": "All sessions signed out"}
+
 @api_router.get("/users/me")
-async def get_current_user_info(current_user: dict = Depends(get_current_user)):
-    return {
+async def get_current_user_info(
+    expand: Optional[str] = Query(None, pattern="^communities$"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    The current user. With expand=communities the joined communities are
+    also returned in full (ordered by id, at most COMMUNITY_BATCH_MAX of
+    them; joined_communities still lists every ID).
+    """
+    user = {
         "name": current_user["name"],
         "email": current_user["email"],
         "is_creator": current_user.get("is_creator", False),
-        "joined_communities": current_user.get("joined_communities", [])
+        "joined_communities": await joined_community_ids(current_user["email"])
     }
+    if expand == "communities":
+        user["communities"] = await joined_communities_expanded(current_user["email"])
+    return user
+
+@api_router.get("/users/me/communities")
+async def get_my_communities(
+    limit: int = Query(COMMUNITY_PAGE_DEFAULT, ge=1, le=COMMUNITY_PAGE_MAX),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Page through the current user's memberships, ordered by community id
+    """
+    return await membership_page({"user_email": current_user["email"]}, "community_id", limit, cursor)
+
+@api_router.get("/users/me/recommendations")
+async def get_my_recommendations(
+    limit: int = Query(RECOMMENDATIONS_DEFAULT, ge=1, le=RECOMMENDATIONS_MAX),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Communities the user hasn't joined, ranked by their summed co-membership
+    similarity to the ones they have. Topped up with trending communities
+    for users with no (or too few) neighbors to go on.
+    """
+    joined = await joined_community_ids(current_user["email"])
+    exclude = set(joined)
+    
+    scores = {}
+    for neighbors in (await community_neighbors(joined[:COMMUNITY_BATCH_MAX])).values():
+        for community_id, similarity in neighbors:
+            if community_id not in exclude:
+                scores[community_id] = scores.get(community_id, 0.0) + similarity
+    ranked = [community_id for community_id, _ in heapq.nlargest(limit, scores.items(), key=lambda item: item[1])]
+    if len(ranked) < limit and trending is not None:
+        for community_id in trending.top_ids(limit + len(exclude)):
+            if len(ranked) == limit:
+                break
+            if community_id not in exclude and community_id not in scores:
+                ranked.append(community_id)
+    
+    cursor = listing("communities").find({"id": {"$in": ranked}}, {"_id": 0})
+    found = {community["id"]: community async for community in cursor}
+    return {"items": [found[community_id] for community_id in ranked if community_id in found]}
 
 # ============ Communities Endpoints ============
 
 @api_router.get("/communities")
-async def get_communities():
+async def get_communities(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=COMMUNITY_PAGE_MAX),
+    cursor: Optional[str] = None,
+    category: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|ndjson)$")
+):
     """
-    Get all communities (ALL 8 communities)
+    Get communities ordered by (created_at, id), optionally only one category
+    (served by the (category, created_at, id) index).
+
+    Without limit/cursor the whole collection is streamed as a JSON array.
+    With limit and/or cursor a single page is returned as
+    {"items": [...], "next_cursor": ...}; pass next_cursor back to continue.
+    format=ndjson streams one community per line instead; a page of ndjson
+    carries its next cursor in the X-Next-Cursor header.
+    Cached responses carry an ETag and honour If-None-Match.
     """
     try:
-        print("🔍 GET /communities called")
-        
-        # Check if communities collection exists
-        collections = await db.list_collection_names()
-        
-        if "communities" not in collections:
-            print("⚠️ Communities collection does not exist")
-            return []
+        paginated = limit is not None or cursor is not None
+        page_size = limit or COMMUNITY_PAGE_DEFAULT
+        base_query = {"category": category} if category else {}
         
-        # Get count
-        count = await db.communities.count_documents({})
-        print(f"📊 Total communities in DB: {count}")
+        if not paginated:
+            # Whole collection: stream it, serving the encoded body from cache when possible
+            key = ("all", category, format)
+            response = cached_body(request, key, format)
+            if response is None:
+                mongo_cursor = listing("communities").find(base_query, {"_id": 0}).sort(COMMUNITY_SORT)
+                response = StreamingResponse(
+                    stream_documents(mongo_cursor, format, key),
+                    media_type=MEDIA_TYPES[format],
+                    headers={"Cache-Control": COMMUNITY_HTTP_CACHE_CONTROL}
+                )
+            return response
         
-        if count == 0:
-            print("⚠️ No communities found in database")
-            return []
-        
-        # Get ALL communities (exclude MongoDB _id field)
-        cursor = db.communities.find({}, {"_id": 0})
-        communities = await cursor.to_list(length=1000)
-        
-        print(f"✅ Found {len(communities)} communities")
-        if len(communities) > 0:
-            print(f"📝 Sample community: {communities[0].get('name')}")
-        
-        return communities
+        key = ("page", category, cursor, page_size, format)
+        response = cached_body(request, key, format)
+        if response is None:
+            generation = community_cache.generation
+            query = {**base_query, **cursor_filter(cursor)} if cursor else base_query
+            
+            # Fetch one extra document to know whether another page exists
+            mongo_cursor = listing("communities").find(query, {"_id": 0}).sort(COMMUNITY_SORT).limit(page_size + 1)
+            communities = await mongo_cursor.to_list(length=page_size + 1)
+            next_cursor = None
+            if len(communities) > page_size:
+                communities = communities[:page_size]
+                next_cursor = community_cursor(communities[-1])
+            
+            headers = {}
+            if format == "ndjson":
+                # No envelope to carry the cursor in: send it as a header
+                body = encode_ndjson(communities)
+                if next_cursor:
+                    headers["X-Next-Cursor"] = next_cursor
+            else:
+                body = encode_json({"items": communities, "next_cursor": next_cursor})
+            response = body_response(request, cache_body(key, body, generation, headers), format)
+        return response
         
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"❌ Error in get_communities: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in get_communities")
         raise HTTPException(status_code=500, detail=f"Error fetching communities: {str(e)}")
 
 @api_router.get("/communities/featured")
-async def get_featured_communities():
+async def get_featured_communities(request: Request):
     """
-    Get featured communities for home page (6 communities)
+    Get featured communities for home page: the top trending communities,
+    topped up with the newest ones while there is little join activity
     """
     try:
-        print("🔍 GET /communities/featured called")
-        
-        # Check if communities collection exists
-        collections = await db.list_collection_names()
-        
-        if "communities" not in collections:
-            print("⚠️ Communities collection does not exist")
-            return []
-        
-        # Get count
-        count = await db.communities.count_documents({})
-        print(f"📊 Total communities in DB: {count}")
+        response = cached_body(request, ("featured",))
+        if response is not None:
+            return response
         
-        if count == 0:
-            print("⚠️ No communities found in database")
-            return []
+        generation = community_cache.generation
         
-        # Get 6 featured communities (most recent by createdAt)
-        cursor = db.communities.find({}, {"_id": 0}).sort("createdAt", -1).limit(6)
-        communities = await cursor.to_list(length=6)
-        
-        print(f"✅ Returning {len(communities)} featured communities for home page")
-        if len(communities) > 0:
-            print(f"📝 Sample featured: {communities[0].get('name')}")
-        
-        return communities
+        leaders = trending.top_ids(FEATURED_COUNT) if trending is not None else []
+        communities = []
+        if leaders:
+            cursor = listing("communities").find({"id": {"$in": leaders}}, {"_id": 0})
+            found = {community["id"]: community async for community in cursor}
+            communities = [found[community_id] for community_id in leaders if community_id in found]
+        if len(communities) < FEATURED_COUNT:
+            missing = FEATURED_COUNT - len(communities)
+            cursor = listing("communities").find({"id": {"$nin": leaders}}, {"_id": 0}).sort("created_at", -1).limit(missing)
+            communities += await cursor.to_list(length=missing)
+        return body_response(request, cache_body(("featured",), encode_json(communities), generation))
         
     except Exception as e:
-        print(f"❌ Error in get_featured_communities: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in get_featured_communities")
         return []  # Return empty array on error, don't crash
 
-@api_router.post("/communities", response_model=Community)
+@api_router.get("/categories")
+async def get_categories():
+    """
+    Category facets: number of communities and total members per category,
+    read from the incrementally maintained category_stats rollup
+    """
+    key = ("categories",)
+    categories = community_cache.get(key)
+    if categories is None:
+        generation = community_cache.generation
+        cursor = listing("category_stats").find({"community_count": {"$gt": 0}}, {"_id": 0}).sort("community_count", -1)
+        categories = await cursor.to_list(length=CATEGORY_LIMIT)
+        community_cache.set(key, categories, generation=generation)
+    return categories
+
+@api_router.get("/communities/batch")
+async def get_communities_batch(ids: str = Query(..., description="Comma-separated community IDs")):
+    """
+    Several communities by ID with one $in query, in the order requested.
+    IDs that don't exist are listed under "missing".
+    """
+    requested = list(dict.fromkeys(part.strip() for part in ids.split(",") if part.strip()))
+    if len(requested) > COMMUNITY_BATCH_MAX:
+        raise HTTPException(status_code=400, detail=f"At most {COMMUNITY_BATCH_MAX} ids per request")
+    
+    cursor = listing("communities").find({"id": {"$in": requested}}, {"_id": 0})
+    found = {community["id"]: community async for community in cursor}
+    return {
+        "items": [found[community_id] for community_id in requested if community_id in found],
+        "missing": [community_id for community_id in requested if community_id not in found]
+    }
+
+def record_trending(deltas: dict):
+    """Feed a live count tick into the trending board; refresh featured if the leaders moved"""
+    leaders = trending.top_ids(FEATURED_COUNT)
+    trending.record(deltas)
+    if trending.top_ids(FEATURED_COUNT) != leaders:
+        community_cache.pop(("featured",))
+
+async def live_count_events(subscriber):
+    try:
+        # Spread reconnects out so a restart doesn't bring every client back at once
+        yield f"retry: {random.randint(LIVE_COUNTS_RETRY_MS, 2 * LIVE_COUNTS_RETRY_MS)}\n\n".encode()
+        while True:
+            chunk = await subscriber.queue.get()
+            if chunk is None:
+                return
+            yield chunk
+    finally:
+        live_counts.unsubscribe(subscriber)
+
+@api_router.get("/communities/live")
+async def stream_member_counts(
+    ids: Optional[str] = Query(None, description="Comma-separated community IDs; every community if omitted")
+):
+    """
+    Server-Sent Events stream of member_count changes: each tick with changes
+    sends a `counts` event mapping community ID -> member_count delta, for
+    the followed communities only.
+    """
+    communities = None
+    if ids is not None:
+        communities = {part.strip() for part in ids.split(",") if part.strip()}
+        if len(communities) > COMMUNITY_BATCH_MAX:
+            raise HTTPException(status_code=400, detail=f"At most {COMMUNITY_BATCH_MAX} ids per request")
+    
+    subscriber = live_counts.subscribe(communities) if live_counts is not None else None
+    if subscriber is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many live subscribers, please retry shortly",
+            headers={"Retry-After": ADMISSION_RETRY_AFTER}
+        )
+    return StreamingResponse(
+        live_count_events(subscriber),
+        media_type="text/event-stream",
+        # X-Accel-Buffering: stop nginx from holding events back
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@api_router.get("/communities/search")
+async def search_communities(
+    q: str = "",
+    category: Optional[str] = None,
+    min_members: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=COMMUNITY_PAGE_MAX),
+    cursor: Optional[str] = None
+):
+    """
+    Search communities by name, description and category.
+
+    Uses the communities text index; results are ranked by text relevance
+    scaled by ln(member_count + e), so among equally relevant matches bigger
+    communities come first. Without q, filtered communities are ranked by
+    member_count alone. Returns {"items": [...], "next_cursor": ...}.
+    """
+    (offset,) = decode_cursor(cursor, 1, int) if cursor else (0,)
+    if offset < 0:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    q = q.strip()
+    key = (q, category, min_members, limit, offset)
+    page = search_cache.get(key)
+    if page is not None:
+        return page
+    generation = search_cache.generation
+    
+    match = {}
+    if q:
+        match["$text"] = {"$search": q}
+    if category:
+        match["category"] = category
+    if min_members:
+        match["member_count"] = {"$gte": min_members}
+    
+    if q:
+        rank = [
+            {"$addFields": {"_score": {"$multiply": [
+                {"$meta": "textScore"},
+                {"$ln": {"$add": [{"$max": [{"$ifNull": ["$member_count", 0]}, 0]}, math.e]}}
+            ]}}},
+            {"$sort": {"_score": -1, "id": 1}}
+        ]
+    else:
+        rank = [{"$sort": {"member_count": -1, "id": 1}}]
+    
+    pipeline = [
+        {"$match": match},
+        *rank,
+        {"$skip": offset},
+        {"$limit": limit + 1},
+        {"$project": {"_id": 0, "_score": 0}}
+    ]
+    communities = await listing("communities").aggregate(pipeline).to_list(length=limit + 1)
+    next_cursor = None
+    if len(communities) > limit:
+        communities = communities[:limit]
+        next_cursor = encode_cursor(offset + limit)
+    
+    page = {"items": communities, "next_cursor": next_cursor}
+    search_cache.set(key, page, generation=generation)
+    return page
+
+@api_router.post("/communities", response_model=Community, dependencies=[Depends(admission("writes"))])
 async def create_community(
     community_input: CommunityCreate,
     current_user: dict = Depends(get_current_user)
@@ -281,20 +1022,146 @@ async def create_community(
     
     # Insert into database
     await db.communities.insert_one(community_doc)
+    await db.category_stats.update_one(
+        {"category": community_doc["category"]},
+        {"$inc": {"community_count": 1, "member_count": 0}},
+        upsert=True
+    )
+    invalidate_community_cache()
     
-    return Community(**community_doc)
+    # The document was built from validated input above; returning a response
+    # skips a second round of response_model validation. insert_one added _id.
+    community_doc.pop("_id", None)
+    return ORJSONResponse(community_doc)
 
 @api_router.get("/communities/{community_id}")
-async def get_community(community_id: str):
+async def get_community(community_id: str, request: Request):
     """
-    Get a single community by ID
+    Get a single community by ID (cached, with an ETag)
     """
+    response = cached_body(request, community_id, cache=community_detail_cache)
+    if response is not None:
+        return response
+    
+    generation = community_detail_cache.generation
     community = await db.communities.find_one({"id": community_id}, {"_id": 0})
     if not community:
         raise HTTPException(status_code=404, detail="Community not found")
-    return community
+    body = encode_json(community)
+    return body_response(request, cache_body(community_id, body, generation, cache=community_detail_cache))
+
+async def community_category(community_id: str) -> Optional[str]:
+    """The community's category, or None if it doesn't exist (cached)"""
+    category = known_communities.get(community_id)
+    if category is not None:
+        return category
+    community = await db.communities.find_one({"id": community_id}, {"_id": 0, "category": 1})
+    if community is None:
+        return None
+    category = community.get("category", "")
+    known_communities.set(community_id, category)
+    return category
 
-@api_router.post("/communities/{community_id}/join")
+async def change_membership(user: dict, community_id: str, joining: bool, session=None) -> str:
+    """
+    Insert or delete the user's membership edge, then adjust member_count and
+    the category rollup only if that actually changed membership. The unique
+    (community_id, user_email) index makes a concurrent duplicate join fail
+    instead of double-counting.
+
+    Returns "changed", "unchanged" (already a member / not a member) or
+    "missing" (the membership changed but no such community exists).
+    
+    With the member_count buffer on, existence is checked up front (and
+    cached) since there is no per-request update to report a missing community.
+    """
+    delta = 1 if joining else -1
+    if member_counts is not None:
+        category = await community_category(community_id)
+        if category is None:
+            return "missing"
+    
+    membership = {"community_id": community_id, "user_email": user["email"]}
+    
+    async def pull_legacy() -> bool:
+        """Take the membership out of the old array; True if it was there"""
+        return await db.users.find_one_and_update(
+            {"email": user["email"], "joined_communities": community_id},
+            {"$pull": {"joined_communities": community_id}},
+            projection={"_id": 1},
+            session=session
+        ) is not None
+    
+    # A join can't tell from the insert whether the array already counted the
+    # user, so it checks first; a leave only needs to when no edge was deleted
+    if LEGACY_MEMBERSHIP_ARRAYS and joining and await pull_legacy():
+        # Already a member (and already counted): just move the edge over
+        try:
+            await db.memberships.insert_one({
+                **membership,
+                "user_name": user["name"],
+                "joined_at": datetime.now(timezone.utc).isoformat()
+            }, session=session)
+        except DuplicateKeyError:
+            pass
+        return "unchanged"
+    if joining:
+        try:
+            await db.memberships.insert_one({
+                **membership,
+                "user_name": user["name"],
+                "joined_at": datetime.now(timezone.utc).isoformat()
+            }, session=session)
+        except DuplicateKeyError:
+            return "unchanged"
+    else:
+        result = await db.memberships.delete_one(membership, session=session)
+        if result.deleted_count == 0 and not (LEGACY_MEMBERSHIP_ARRAYS and await pull_legacy()):
+            return "unchanged"
+    
+    if member_counts is not None:
+        member_counts.add(community_id, delta)
+    else:
+        community = await db.communities.find_one_and_update(
+            {"id": community_id},
+            {"$inc": {"member_count": delta}},
+            projection={"_id": 0, "category": 1},
+            session=session
+        )
+        if community is None:
+            return "missing"
+        category = community.get("category", "")
+    
+    if category_counts is not None:
+        category_counts.add(category, delta)
+    return "changed"
+
+async def apply_membership_change(user: dict, community_id: str, joining: bool) -> str:
+    """
+    Run change_membership, in a transaction when MEMBERSHIP_TRANSACTIONS=1
+    (replica set only), otherwise removing the new membership by hand if the
+    community turned out not to exist.
+    """
+    if MEMBERSHIP_TRANSACTIONS:
+        async with await client.start_session() as session:
+            async with session.start_transaction():
+                outcome = await change_membership(user, community_id, joining, session=session)
+                if outcome != "changed":
+                    await session.abort_transaction()
+    else:
+        outcome = await change_membership(user, community_id, joining)
+        if outcome == "missing" and joining and member_counts is None:
+            await db.memberships.delete_one({"community_id": community_id, "user_email": user["email"]})
+    
+    if outcome == "changed":
+        invalidate_community_cache()
+        if live_counts is not None:
+            live_counts.add(community_id, 1 if joining else -1)
+        if membership_events is not None:
+            membership_events.add(community_id, user["email"], joining)
+    return outcome
+
+@api_router.post("/communities/{community_id}/join", dependencies=[Depends(admission("writes"))])
 async def join_community(
     community_id: str,
     current_user: dict = Depends(get_current_user)
@@ -302,33 +1169,16 @@ async def join_community(
     """
     Join a community
     """
-    # Check if community exists
-    community = await db.communities.find_one({"id": community_id})
-    if not community:
-        raise HTTPException(status_code=404, detail="Community not found")
-    
-    user_email = current_user["email"]
-    joined_communities = current_user.get("joined_communities", [])
+    outcome = await apply_membership_change(current_user, community_id, joining=True)
     
-    # Check if already joined
-    if community_id in joined_communities:
+    if outcome == "missing":
+        raise HTTPException(status_code=404, detail="Community not found")
+    if outcome == "unchanged":
         raise HTTPException(status_code=400, detail="Already joined this community")
     
-    # Add community to user's joined list
-    await db.users.update_one(
-        {"email": user_email},
-        {"$push": {"joined_communities": community_id}}
-    )
-    
-    # Increment member count
-    await db.communities.update_one(
-        {"id": community_id},
-        {"$inc": {"member_count": 1}}
-    )
-    
     return {"message": "Successfully joined community"}
 
-@api_router.post("/communities/{community_id}/leave")
+@api_router.post("/communities/{community_id}/leave", dependencies=[Depends(admission("writes"))])
 async def leave_community(
     community_id: str,
     current_user: dict = Depends(get_current_user)
@@ -336,91 +1186,228 @@ async def leave_community(
     """
     Leave a community
     """
-    # Check if community exists
-    community = await db.communities.find_one({"id": community_id})
+    outcome = await apply_membership_change(current_user, community_id, joining=False)
+    
+    if outcome == "missing":
+        raise HTTPException(status_code=404, detail="Community not found")
+    if outcome == "unchanged":
+        # Only on this error path: tell a missing community apart from a non-member
+        if not await db.communities.find_one({"id": community_id}, {"_id": 1}):
+            raise HTTPException(status_code=404, detail="Community not found")
+        raise HTTPException(status_code=400, detail="Not a member of this community")
+    
+    return {"message": "Successfully left community"}
+
+@api_router.get("/communities/{community_id}/members")
+async def get_community_members(
+    community_id: str,
+    limit: int = Query(COMMUNITY_PAGE_DEFAULT, ge=1, le=COMMUNITY_PAGE_MAX),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Page through a community's members in join order (names and join times
+    only, no emails). Only the community's creator and members may list them.
+    """
+    community = await db.communities.find_one({"id": community_id}, {"_id": 0, "creator_id": 1})
     if not community:
         raise HTTPException(status_code=404, detail="Community not found")
+    if (
+        community.get("creator_id") != current_user["email"]
+        and not await db.memberships.find_one(
+            {"community_id": community_id, "user_email": current_user["email"]}, {"_id": 1}
+        )
+        and community_id not in await legacy_community_ids(current_user["email"])
+    ):
+        raise HTTPException(status_code=403, detail="Only the creator and members can see the member list")
     
-    user_email = current_user["email"]
-    joined_communities = current_user.get("joined_communities", [])
+    query = {"community_id": community_id}
+    if cursor:
+        (after,) = decode_cursor(cursor, 1)
+        if not ObjectId.is_valid(after):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query["_id"] = {"$gt": ObjectId(after)}
+    mongo_cursor = db.memberships.find(query, {"user_name": 1, "joined_at": 1}).sort("_id", 1).limit(limit + 1)
+    memberships = await mongo_cursor.to_list(length=limit + 1)
+    next_cursor = None
+    if len(memberships) > limit:
+        memberships = memberships[:limit]
+        next_cursor = encode_cursor(str(memberships[-1]["_id"]))
+    return {
+        "items": [{"user_name": m.get("user_name"), "joined_at": m.get("joined_at")} for m in memberships],
+        "next_cursor": next_cursor
+    }
+
+# ============ Creator Endpoints ============
+
+@api_router.get("/creators/me/stats")
+async def get_creator_stats(
+    days: int = Query(CREATOR_STATS_DAYS_DEFAULT, ge=1, le=CREATOR_STATS_DAYS_MAX),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Member growth for the current creator's communities over the last `days`
+    UTC days, from the membership_daily rollups (never the raw events):
+    totals across communities, one entry per day (joins, leaves, net and
+    total members at the end of the day), and per-community window totals.
+    """
+    if not current_user.get("is_creator", False):
+        raise HTTPException(status_code=403, detail="Only creators have community stats")
     
-    # Check if not a member
-    if community_id not in joined_communities:
-        raise HTTPException(status_code=400, detail="Not a member of this community")
+    today = datetime.now(timezone.utc).date()
+    day_keys = [(today - timedelta(days=offset)).isoformat() for offset in range(days - 1, -1, -1)]
     
-    # Remove community from user's joined list
-    await db.users.update_one(
-        {"email": user_email},
-        {"$pull": {"joined_communities": community_id}}
+    communities = await db.communities.find(
+        {"creator_id": current_user["email"]},
+        {"_id": 0, "id": 1, "name": 1, "member_count": 1}
+    ).to_list(length=None)
+    per_community = {
+        community["id"]: {**community, "joins": 0, "leaves": 0}
+        for community in communities
+    }
+    daily = {day: [0, 0] for day in day_keys}
+    cursor = db.membership_daily.find(
+        {"creator_id": current_user["email"], "day": {"$gte": day_keys[0]}},
+        {"_id": 0, "community_id": 1, "day": 1, "joins": 1, "leaves": 1}
     )
+    async for rollup in cursor:
+        counts = daily.get(rollup["day"])
+        if counts is None:
+            continue  # a day after today, from a worker with a skewed clock
+        counts[0] += rollup["joins"]
+        counts[1] += rollup["leaves"]
+        community = per_community.get(rollup["community_id"])
+        if community is not None:
+            community["joins"] += rollup["joins"]
+            community["leaves"] += rollup["leaves"]
     
-    # Decrement member count
-    await db.communities.update_one(
-        {"id": community_id},
-        {"$inc": {"member_count": -1}}
-    )
+    # Walk back from today's member total to get each day's closing total
+    members = sum(community.get("member_count", 0) for community in communities)
+    series = []
+    for day in reversed(day_keys):
+        joins, leaves = daily[day]
+        series.append({"day": day, "joins": joins, "leaves": leaves, "net": joins - leaves, "members": members})
+        members -= joins - leaves
+    series.reverse()
     
-    return {"message": "Successfully left community"}
+    for community in per_community.values():
+        community["net"] = community["joins"] - community["leaves"]
+    joins = sum(entry["joins"] for entry in series)
+    leaves = sum(entry["leaves"] for entry in series)
+    return {
+        "totals": {
+            "communities": len(communities),
+            "members": series[-1]["members"],
+            "joins": joins,
+            "leaves": leaves,
+            "net": joins - leaves
+        },
+        "daily": series,
+        "communities": sorted(per_community.values(), key=lambda community: -community["net"])
+    }
 
 # ============ Debug Endpoints ============
 
 @api_router.get("/debug/db")
 async def debug_database():
     """
-    Debug endpoint to check database connection and collections
+    Debug endpoint to check database connection and collections. Counts come
+    from collection metadata (estimated_document_count), not a scan, and the
+    result is cached for DEBUG_STATS_TTL seconds.
     """
     try:
-        # Get all collections
+        stats = debug_cache.get("db")
+        if stats is not None:
+            return stats
+        
         collections = await db.list_collection_names()
         
         # Get communities info
-        communities_info = {}
+        communities_info = {"exists": False, "count": 0, "sample": []}
         if "communities" in collections:
-            count = await db.communities.count_documents({})
+            count = await db.communities.estimated_document_count()
             sample = []
             if count > 0:
                 cursor = db.communities.find({}, {"_id": 0}).limit(2)
                 sample = await cursor.to_list(length=2)
-            
-            communities_info = {
-                "exists": True,
-                "count": count,
-                "sample": sample
-            }
-        else:
-            communities_info = {
-                "exists": False,
-                "count": 0,
-                "sample": []
-            }
+            communities_info = {"exists": True, "count": count, "sample": sample}
         
         # Get users info
-        users_info = {}
+        users_info = {"exists": False, "count": 0}
         if "users" in collections:
-            count = await db.users.count_documents({})
-            users_info = {
-                "exists": True,
-                "count": count
-            }
-        else:
-            users_info = {
-                "exists": False,
-                "count": 0
-            }
+            users_info = {"exists": True, "count": await db.users.estimated_document_count()}
         
-        return {
+        stats = {
             "success": True,
             "database": db_name,
             "collections": collections,
             "communities": communities_info,
             "users": users_info
         }
+        debug_cache.set("db", stats)
+        return stats
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+@api_router.get("/debug/seed")
+async def seed_communities_debug():
+    """Seed the demo communities from data/seed_communities.ndjson"""
+    try:
+        # Check if communities already exist
+        count = await db.communities.estimated_document_count()
+        if count > 0:
+            return {"message": f"Database already has {count} communities. No action taken."}
+        
+        loaded = await load_seed_communities(db)
+        invalidate_community_cache()
+        debug_cache.clear()
+        return {
+            "success": True,
+            "message": f"✅ Successfully seeded {loaded} communities!",
+            "count": loaded
+        }
+        
     except Exception as e:
         return {
             "success": False,
             "error": str(e)
         }
 
+async def ping_mongo() -> bool:
+    """Ping Mongo with a short timeout and cache the answer for /readyz"""
+    try:
+        await asyncio.wait_for(client.admin.command("ping"), READINESS_TIMEOUT)
+        ready = True
+    except Exception as e:
+        logger.warning("MongoDB ping failed", extra={"error": str(e)})
+        ready = False
+    readiness_cache.set("mongo", ready)
+    return ready
+
+@api_router.get("/healthz")
+async def healthz():
+    """Liveness: the process is serving requests. No I/O."""
+    return {"status": "ok"}
+
+@api_router.get("/readyz")
+async def readyz():
+    """
+    Readiness: Mongo answered a ping within READINESS_TIMEOUT. The result is
+    cached briefly and concurrent probes share one ping.
+    """
+    global readiness_check
+    ready = readiness_cache.get("mongo")
+    if ready is None:
+        if readiness_check is None or readiness_check.done():
+            readiness_check = asyncio.create_task(ping_mongo())
+        ready = await asyncio.shield(readiness_check)
+    if not ready:
+        return ORJSONResponse({"status": "unavailable", "mongo": False}, status_code=503)
+    return {"status": "ok", "mongo": True}
+
 @api_router.get("/test")
 async def test_endpoint():
     """
@@ -433,6 +1420,36 @@ async def test_endpoint():
         "timestamp": datetime.now(timezone.utc).isoformat()
     }
 
+# ============ Metrics ============
+
+def process_samples():
+    """Cache effectiveness and dropped log records, read at scrape time"""
+    for name, cache in (("community", community_cache), ("search", search_cache),
+                        ("community_detail", community_detail_cache), ("token", token_cache),
+                        ("user", user_cache), ("neighbors", neighbor_cache)):
+        labels = (("cache", name),)
+        yield "biddge_cache_hits_total", "counter", labels, cache.hits
+        yield "biddge_cache_misses_total", "counter", labels, cache.misses
+        yield "biddge_cache_entries", "gauge", labels, len(cache)
+    yield "biddge_log_records_dropped_total", "counter", (), log_listener.handler.dropped
+    if revoked_tokens is not None:
+        yield "biddge_revoked_token_users", "gauge", (), len(revoked_tokens)
+
+metrics.add_collector(process_samples)
+metrics.add_collector(lambda: live_counts.samples() if live_counts is not None else ())
+metrics.add_collector(lambda: trending.samples() if trending is not None else ())
+metrics.add_collector(lambda: membership_events.samples() if membership_events is not None else ())
+for limiter in [*admission_limiters.values(), auth_ip_limiter, auth_account_limiter]:
+    metrics.add_collector(limiter.samples)
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """
+    Prometheus text exposition of this worker's request, Mongo command,
+    connection pool and cache metrics
+    """
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 # ============ App Configuration ============
 
 # Include router
@@ -440,7 +1457,7 @@ app.include_router(api_router)
 
 # Configure CORS
 cors_origins = os.environ.get('CORS_ORIGINS', 'http://localhost:3000,http://127.0.0.1:3000').split(',')
-print(f"🔓 CORS allowed origins: {cors_origins}")
+logger.info("CORS allowed origins", extra={"origins": cors_origins})
 
 app.add_middleware(
     CORSMiddleware,
@@ -448,157 +1465,139 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# Added last so it is outermost and times the whole request, CORS included
+app.add_middleware(
+    RequestTimingMiddleware,
+    sample_rate=LOG_SAMPLE_RATE,
+    slow_ms=LOG_SLOW_MS,
+    metrics=metrics,
+    streaming_routes={"/api/communities/live"}
 )
-logger = logging.getLogger(__name__)
 
 # ============ Startup/Shutdown Events ============
 
 @app.on_event("startup")
 async def startup_db_client():
-    print("✅ Application startup complete")
-    print(f"📊 Connected to database: {db_name}")
-    
-    # Check if communities collection exists and has data
-    collections = await db.list_collection_names()
-    if "communities" in collections:
-        count = await db.communities.count_documents({})
-        print(f"📊 Communities in database: {count}")
-    else:
-        print("⚠️ Communities collection does not exist yet")
+    logger.info("Application startup complete", extra={"database": db_name})
+    
+    # Connect now rather than on the first request (with MONGO_MIN_POOL_SIZE
+    # the pool then fills in the background) and prime /readyz. No collection
+    # scans here: they slow cold starts and /debug/db reports counts on demand.
+    await ping_mongo()
+    
+    # Create missing indexes (see indexes.py; set ENSURE_INDEXES=0 to manage them by hand)
+    if os.environ.get('ENSURE_INDEXES', '1') == '1':
+        try:
+            created = await ensure_indexes(db)
+            logger.info("Indexes ensured", extra={"indexes_created": created})
+        except Exception:
+            logger.exception("Index bootstrap failed")
+    
+    global member_counts, category_counts, revoked_tokens, live_counts, trending, membership_events
+    revoked_tokens = RevocationSet(db.revocations, interval=REVOCATION_REFRESH_INTERVAL)
+    try:
+        await revoked_tokens.refresh()
+    except Exception:
+        logger.exception("Revocation set load failed")
+    revoked_tokens.start()
+    
+    category_counts = CounterBuffer(
+        db.category_stats,
+        key_field="category",
+        upsert=True,
+        interval=MEMBER_COUNT_FLUSH_INTERVAL,
+        max_pending=MEMBER_COUNT_MAX_PENDING,
+        on_flush=lambda: community_cache.pop(("categories",))
+    )
+    category_counts.start()
+    
+    # Build the category rollup once for databases that predate it
+    try:
+        if await db.category_stats.estimated_document_count() == 0:
+            rebuilt = await rebuild_category_stats(db)
+            logger.info("Built category_stats", extra={"categories": rebuilt})
+    except Exception:
+        logger.exception("category_stats rebuild failed")
+    
+    if MEMBER_COUNT_BUFFER:
+        member_counts = CounterBuffer(
+            db.communities,
+            interval=MEMBER_COUNT_FLUSH_INTERVAL,
+            max_pending=MEMBER_COUNT_MAX_PENDING,
+            on_flush=invalidate_community_cache
+        )
+        member_counts.start()
+    
+    if MEMBERSHIP_EVENTS:
+        membership_events = EventWriter(
+            db,
+            interval=MEMBER_COUNT_FLUSH_INTERVAL,
+            max_pending=MEMBER_COUNT_MAX_PENDING
+        )
+        membership_events.start()
+    
+    trending = TrendingBoard(
+        half_life=TRENDING_HALF_LIFE_HOURS * 3600,
+        collection=db.leaderboards,
+        snapshot_interval=TRENDING_SNAPSHOT_INTERVAL
+    )
+    try:
+        await trending.load()
+    except Exception:
+        logger.exception("Trending snapshot load failed")
+    trending.start()
+    
+    events = None
+    if LIVE_COUNTS_SHARED:
+        try:
+            events = await ensure_events_collection(db, "live_count_events", LIVE_COUNTS_EVENTS_BYTES)
+        except Exception:
+            logger.exception("live_count_events setup failed, live counts stay per worker")
+    live_counts = CountBroadcaster(
+        tick=LIVE_COUNTS_TICK,
+        queue_size=LIVE_COUNTS_QUEUE,
+        max_subscribers=LIVE_COUNTS_MAX_SUBSCRIBERS,
+        keepalive=LIVE_COUNTS_KEEPALIVE,
+        events=events,
+        on_tick=record_trending
+    )
+    live_counts.start()
+    
+    if COMMUNITY_CACHE_CHANGE_STREAM:
+        app.state.cache_watcher = asyncio.create_task(
+            invalidate_on_change(db.communities, [community_cache, search_cache, community_detail_cache])
+        )
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    watcher = getattr(app.state, "cache_watcher", None)
+    if watcher:
+        watcher.cancel()
+    # Don't lose buffered deltas or events on a clean shutdown
+    for buffer in (member_counts, category_counts, membership_events):
+        if buffer is not None:
+            await buffer.stop()
+    if revoked_tokens is not None:
+        revoked_tokens.stop()
+    if live_counts is not None:
+        await live_counts.stop()
+    if trending is not None:
+        await trending.stop()
+    password_pool.shutdown()
     client.close()
-    print("🔒 MongoDB connection closed")
-
-@api_router.get("/debug/seed")
-async def seed_communities_debug():
-    """Seed communities to MongoDB Atlas"""
-    import uuid
-    from datetime import datetime, timezone
-    
-    try:
-        # Check if communities already exist
-        count = await db.communities.count_documents({})
-        if count > 0:
-            return {"message": f"Database already has {count} communities. No action taken."}
-        
-        # Your 8 communities
-        communities = [
-            {
-                "id": str(uuid.uuid4()),
-                "name": "Career Growth",
-                "description": "Connect with professionals and mentors to accelerate your career journey. Share insights, get advice, and grow together.",
-                "category": "Career Growth",
-                "creator_id": "system@biddge.com",
-                "creator_name": "Biddge Team",
-                "member_count": 2847,
-                "image_url": "https://images.unsplash.com/photo-1522071820081-009f0129c71c?w=800&auto=format&fit=crop",
-                "created_at": datetime.now(timezone.utc).isoformat()
-            },
-            {
-                "id": str(uuid.uuid4()),
-                "name": "Startup Builders",
-                "description": "A vibrant community for founders, makers, and entrepreneurs building the next big thing. Share your journey, learn from others, and find co-founders.",
-                "category": "Startup Builders",
-                "creator_id": "system@biddge.com",
-                "creator_name": "Biddge Team",
-                "member_count": 1823,
-                "image_url": "https://images.unsplash.com/photo-1515187029135-18ee286d815b?w=800&auto=format&fit=crop",
-                "created_at": datetime.now(timezone.utc).isoformat()
-            },
-            {
-                "id": str(uuid.uuid4()),
-                "name": "AI & ML Hub",
-                "description": "Explore the world of artificial intelligence and machine learning. From beginners to experts, learn, share, and innovate together.",
-                "category": "AI & ML Hub",
-                "creator_id": "system@biddge.com",
-                "creator_name": "Biddge Team",
-                "member_count": 4276,
-                "image_url": "https://images.unsplash.com/photo-1677442136019-21780ecad995?w=800&auto=format&fit=crop",
-                "created_at": datetime.now(timezone.utc).isoformat()
-            },
-            {
-                "id": str(uuid.uuid4()),
-                "name": "Tech Community",
-                "description": "The largest tech community on Biddge. Discuss latest technologies, share projects, and stay updated with industry trends.",
-                "category": "Tech Community",
-                "creator_id": "system@biddge.com",
-                "creator_name": "Biddge Team",
-                "member_count": 8542,
-                "image_url": "https://images.unsplash.com/photo-1522071820081-009f0129c71c?w=800&auto=format&fit=crop",
-                "created_at": datetime.now(timezone.utc).isoformat()
-            },
-            {
-                "id": str(uuid.uuid4()),
-                "name": "Fitness & Health",
-                "description": "Transform your body and mind. Share workout routines, nutrition tips, and wellness advice with a supportive community.",
-                "category": "Fitness & Health",
-                "creator_id": "system@biddge.com",
-                "creator_name": "Biddge Team",
-                "member_count": 3641,
-                "image_url": "https://images.unsplash.com/photo-1571019614242-c5c5dee9f50b?w=800&auto=format&fit=crop",
-                "created_at": datetime.now(timezone.utc).isoformat()
-            },
-            {
-                "id": str(uuid.uuid4()),
-                "name": "Design Circle",
-                "description": "A creative space for designers to share work, get feedback, and learn new design techniques. All design disciplines welcome.",
-                "category": "Design Circle",
-                "creator_id": "system@biddge.com",
-                "creator_name": "Biddge Team",
-                "member_count": 2156,
-                "image_url": "https://images.unsplash.com/photo-1561070791-2526d30994b5?w=800&auto=format&fit=crop",
-                "created_at": datetime.now(timezone.utc).isoformat()
-            },
-            {
-                "id": str(uuid.uuid4()),
-                "name": "Digital Marketing",
-                "description": "Master the art of digital marketing. Learn SEO, social media, content strategy, and analytics from industry experts.",
-                "category": "Marketing",
-                "creator_id": "system@biddge.com",
-                "creator_name": "Biddge Team",
-                "member_count": 1892,
-                "image_url": "https://images.unsplash.com/photo-1557838923-2985c318be48?w=800&auto=format&fit=crop",
-                "created_at": datetime.now(timezone.utc).isoformat()
-            },
-            {
-                "id": str(uuid.uuid4()),
-                "name": "Personal Finance",
-                "description": "Take control of your financial future. Learn about investing, budgeting, and wealth building with our community of finance enthusiasts.",
-                "category": "Finance",
-                "creator_id": "system@biddge.com",
-                "creator_name": "Biddge Team",
-                "member_count": 3245,
-                "image_url": "https://images.unsplash.com/photo-1579621970588-a35d0e7ab9b6?w=800&auto=format&fit=crop",
-                "created_at": datetime.now(timezone.utc).isoformat()
-            }
-        ]
-        
-        result = await db.communities.insert_many(communities)
-        return {
-            "success": True,
-            "message": f"✅ Successfully seeded {len(result.inserted_ids)} communities!",
-            "count": len(result.inserted_ids)
-        }
-        
-    except Exception as e:
-        return {
-            "success": False,
-            "error": str(e)
-        }
+    logger.info("MongoDB connection closed")
+    # Flush queued log records before the process exits
+    log_listener.stop()
 
 # ============ Main Entry Point ============
 
+# Development server with auto-reload; production runs serve.py
 if __name__ == "__main__":
     import uvicorn
-    print("🚀 Starting Biddge API server...")
+    logger.info("Starting Biddge API server")
     uvicorn.run(
         "server:app",
         host="0.0.0.0",
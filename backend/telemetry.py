@@ -0,0 +1,377 @@
+"""
+Structured logging and request timing for the API server.
+
+Log records are handed to a bounded in-memory queue and written to stdout by
+a background thread (QueueListener), so logging never blocks the event loop
+on terminal or pipe I/O. If the queue is full the record is dropped and
+counted rather than waited on.
+
+RequestTimingMiddleware logs one record per request with the route template,
+status, total latency and time spent in Mongo commands. Mongo time comes from
+DatabaseTimer, a pymongo CommandListener registered on the client: Motor runs
+each command in a worker thread with a copy of the request's context, so the
+listener can add to a per-request accumulator held in a ContextVar.
+
+Metrics is a small registry of counters, gauges and histograms rendered in
+the Prometheus text format for GET /metrics. Like the caches, it lives in
+each worker process, so scrape every worker (or sum across them).
+"""
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import threading
+import time
+from contextvars import ContextVar
+
+from pymongo import monitoring
+
+# Attributes every LogRecord has; anything else was passed via extra= and is
+# emitted as a structured field
+_STANDARD_ATTRS = set(logging.makeLogRecord({}).__dict__) | {"message", "asctime"}
+
+# Per-request Mongo time accumulator: [total_ms, command_count]
+_db_time = ContextVar("db_time", default=None)
+
+# Histogram buckets in seconds, from a cached read up to a slow bcrypt request
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record):
+        line = super().format(record)
+        fields = {
+            key: value for key, value in record.__dict__.items()
+            if key not in _STANDARD_ATTRS and not key.startswith("_")
+        }
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return line
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging(level: str = "INFO", fmt: str = "text", queue_size: int = 10000):
+    """
+    Route the root logger (and uvicorn's) through a queue drained by a
+    background thread. Returns the QueueListener; stop() it on shutdown to
+    flush what is left. The listener's `handler` counts dropped records.
+    """
+    log_queue = queue.Queue(maxsize=queue_size)
+    stream = logging.StreamHandler(sys.stdout)
+    if fmt == "json":
+        stream.setFormatter(JsonFormatter())
+    else:
+        stream.setFormatter(TextFormatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+
+    handler = DroppingQueueHandler(log_queue)
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(level.upper())
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        logging.getLogger(name).handlers = []
+        logging.getLogger(name).propagate = True
+
+    listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=False)
+    listener.handler = handler
+    listener.start()
+    return listener
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+class Metrics:
+    """
+    In-process counters, gauges and histograms with Prometheus text output.
+
+    Labels are passed as tuples of (name, value) pairs. Updates may come from
+    the event loop and from Motor's worker threads (command listeners), so
+    they are serialised with a lock. Collectors are callables run at render
+    time that return (name, kind, labels, value) samples for state owned by
+    other objects (pool sizes, cache hit counts).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._meta = {}  # name -> (kind, help, buckets)
+        self._values = {}  # name -> {labels: value or [bucket counts, sum, count]}
+        self._collectors = []
+
+    def describe(self, name: str, kind: str, help_text: str, buckets=LATENCY_BUCKETS):
+        self._meta[name] = (kind, help_text, buckets if kind == "histogram" else None)
+        self._values.setdefault(name, {})
+
+    def inc(self, name: str, labels=(), value: float = 1):
+        with self._lock:
+            series = self._values[name]
+            series[labels] = series.get(labels, 0) + value
+
+    def set(self, name: str, value: float, labels=()):
+        with self._lock:
+            self._values[name][labels] = value
+
+    def observe(self, name: str, value: float, labels=()):
+        buckets = self._meta[name][2]
+        with self._lock:
+            series = self._values[name]
+            entry = series.get(labels)
+            if entry is None:
+                entry = series[labels] = [[0] * len(buckets), 0.0, 0]
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+
+    def add_collector(self, collector):
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        collected = {}
+        for collector in self._collectors:
+            for name, kind, labels, value in collector():
+                collected.setdefault((name, kind), []).append((labels, value))
+
+        lines = []
+        with self._lock:
+            for name, (kind, help_text, buckets) in self._meta.items():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in self._values[name].items():
+                    if kind != "histogram":
+                        lines.append(f"{name}{_format_labels(labels)} {value}")
+                        continue
+                    counts, total, count = value
+                    cumulative = 0
+                    for bound, bucket_count in zip(buckets, counts):
+                        cumulative += bucket_count
+                        lines.append(f"{name}_bucket{_format_labels(labels + (('le', bound),))} {cumulative}")
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {total}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {count}")
+        for (name, kind), samples in collected.items():
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def command_collection(command_name: str, command) -> str:
+    """Collection a command targets, or "" for admin commands such as ping"""
+    if command_name == "getMore":
+        return command.get("collection", "")
+    target = command.get(command_name)
+    return target if isinstance(target, str) else ""
+
+
+class DatabaseTimer(monitoring.CommandListener):
+    """
+    Adds each Mongo command's duration to the current request's accumulator
+    and, given a Metrics registry, to a per collection/command histogram.
+    """
+
+    def __init__(self, metrics: Metrics = None):
+        self.metrics = metrics
+        # Finished events don't carry the command document, so remember the
+        # collection from the started event
+        self._collections = {}
+        if metrics is not None:
+            metrics.describe("biddge_mongo_command_duration_seconds", "histogram",
+                             "Mongo command latency by collection and command")
+            metrics.describe("biddge_mongo_command_failures_total", "counter",
+                             "Mongo commands that returned an error")
+
+    def _record(self, event, failed: bool):
+        totals = _db_time.get()
+        if totals is not None:
+            totals[0] += event.duration_micros / 1000
+            totals[1] += 1
+        if self.metrics is not None:
+            collection = self._collections.pop((event.connection_id, event.request_id), "")
+            labels = (("collection", collection), ("command", event.command_name))
+            self.metrics.observe("biddge_mongo_command_duration_seconds", event.duration_micros / 1e6, labels)
+            if failed:
+                self.metrics.inc("biddge_mongo_command_failures_total", labels)
+
+    def started(self, event):
+        if self.metrics is not None:
+            self._collections[(event.connection_id, event.request_id)] = command_collection(
+                event.command_name, event.command
+            )
+
+    def succeeded(self, event):
+        self._record(event, failed=False)
+
+    def failed(self, event):
+        self._record(event, failed=True)
+
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    """Tracks open and checked-out connections per server for the metrics endpoint"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.open = {}
+        self.checked_out = {}
+        self.checkout_failures = {}
+
+    def _add(self, counts, address, delta):
+        key = f"{address[0]}:{address[1]}"
+        with self._lock:
+            counts[key] = counts.get(key, 0) + delta
+
+    def connection_created(self, event):
+        self._add(self.open, event.address, 1)
+
+    def connection_closed(self, event):
+        self._add(self.open, event.address, -1)
+
+    def connection_checked_out(self, event):
+        self._add(self.checked_out, event.address, 1)
+
+    def connection_checked_in(self, event):
+        self._add(self.checked_out, event.address, -1)
+
+    def connection_check_out_failed(self, event):
+        self._add(self.checkout_failures, event.address, 1)
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def samples(self):
+        with self._lock:
+            for name, kind, counts in (
+                ("biddge_mongo_pool_connections", "gauge", self.open),
+                ("biddge_mongo_pool_checked_out", "gauge", self.checked_out),
+                ("biddge_mongo_pool_checkout_failures_total", "counter", self.checkout_failures),
+            ):
+                for address, value in counts.items():
+                    yield name, kind, (("address", address),), value
+
+
+class RequestTimingMiddleware:
+    """
+    ASGI middleware logging route, status, latency and Mongo time per request.
+
+    Successful fast requests are sampled at sample_rate; 5xx responses and
+    requests slower than slow_ms are always logged. Given a Metrics registry,
+    every request is also counted there, sampled or not.
+
+    Routes in streaming_routes (long-lived event streams) are counted but
+    left out of the latency histogram and never logged as slow.
+    """
+
+    def __init__(self, app, logger_name: str = "biddge.request", sample_rate: float = 1.0,
+                 slow_ms: float = 500.0, metrics: Metrics = None, streaming_routes=()):
+        self.app = app
+        self.logger = logging.getLogger(logger_name)
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.metrics = metrics
+        self.streaming_routes = frozenset(streaming_routes)
+        if metrics is not None:
+            metrics.describe("biddge_http_requests_total", "counter", "Requests by route and status")
+            metrics.describe("biddge_http_request_duration_seconds", "histogram", "Request latency by route")
+            metrics.describe("biddge_http_request_db_commands_total", "counter",
+                             "Mongo commands issued while serving each route")
+            metrics.describe("biddge_http_requests_in_flight", "gauge", "Requests currently being served")
+            metrics.set("biddge_http_requests_in_flight", 0)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        totals = [0.0, 0]
+        token = _db_time.set(totals)
+        status = 500
+        start = time.perf_counter()
+        if self.metrics is not None:
+            self.metrics.inc("biddge_http_requests_in_flight")
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _db_time.reset(token)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            route = scope.get("route")
+            streaming = route is not None and route.path in self.streaming_routes
+            if self.metrics is not None:
+                # Label by route template; unmatched paths share one label to bound cardinality
+                labels = (("method", scope["method"]), ("route", route.path if route is not None else "unmatched"))
+                self.metrics.inc("biddge_http_requests_in_flight", value=-1)
+                self.metrics.inc("biddge_http_requests_total", labels + (("status", status),))
+                if not streaming:
+                    self.metrics.observe("biddge_http_request_duration_seconds", elapsed_ms / 1000, labels)
+                self.metrics.inc("biddge_http_request_db_commands_total", labels, totals[1])
+            slow = elapsed_ms >= self.slow_ms and not streaming
+            if status >= 500 or slow or random.random() < self.sample_rate:
+                level = logging.ERROR if status >= 500 else logging.WARNING if slow else logging.INFO
+                self.logger.log(level, "request", extra={
+                    "method": scope["method"],
+                    "route": route.path if route is not None else scope["path"],
+                    "status": status,
+                    "duration_ms": round(elapsed_ms, 2),
+                    "db_ms": round(totals[0], 2),
+                    "db_commands": totals[1],
+                })
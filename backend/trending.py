@@ -0,0 +1,166 @@
+"""
+Trending communities: a time-decayed join score kept in memory.
+
+A community's score is the sum of its net joins, each weighted by
+2^(-age / half_life). Rather than decaying every score as time passes, an
+event at time t adds 2^((t - origin) / half_life): every score decays by the
+same factor, so that factor can be left out and scores only ever change when
+joins/leaves happen. The scores are rescaled (and dead ones dropped) once the
+weights grow large, every REBASE_HALF_LIVES half-lives.
+
+Because ranks only move on events, the leaderboard is maintained as a sorted
+list of the `depth` best scores next to the score dict. An update touches one
+entry (O(depth) at worst); reading the top k is a slice. The list only needs
+rebuilding from all scores (heapq.nlargest) when enough leaders have lost
+members that fewer than `capacity` entries are known to be exact.
+
+The server feeds it the per-tick deltas from the live count broadcaster
+(which include other workers' joins when they are shared, see live_counts.py)
+and snapshots the leaders to Mongo so a restart doesn't start from nothing.
+"""
+import asyncio
+import heapq
+import logging
+import time
+from bisect import bisect_left, insort
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+REBASE_HALF_LIVES = 64
+
+
+class TrendingBoard:
+    def __init__(self, half_life: float = 6 * 3600, capacity: int = 50, collection=None,
+                 snapshot_interval: float = 60.0, snapshot_size: int = 1000, clock=time.time):
+        self.half_life = half_life
+        self.capacity = capacity
+        self.depth = capacity * 2
+        self.collection = collection
+        self.snapshot_interval = snapshot_interval
+        self.snapshot_size = snapshot_size
+        self.clock = clock
+        self.origin = clock()
+        self.scores = {}  # community id -> score, scaled to origin
+        self.rebuilds = 0
+        self._leaders = []  # (-score, id), ascending: best first
+        self._bound = 0.0  # no community outside _leaders scores above this
+        self._dirty = False
+        self._task = None
+
+    def __len__(self):
+        return len(self.scores)
+
+    def _weight(self, now: float) -> float:
+        return 2.0 ** ((now - self.origin) / self.half_life)
+
+    def _rebase(self, now: float):
+        factor = 1 / self._weight(now)
+        self.origin = now
+        self.scores = {key: score * factor for key, score in self.scores.items() if score * factor > 1e-9}
+        self._rebuild()
+
+    def _rebuild(self):
+        best = heapq.nlargest(self.depth, self.scores.items(), key=lambda item: item[1])
+        self._leaders = sorted((-score, key) for key, score in best)
+        self._bound = best[-1][1] if len(self.scores) > len(best) else 0.0
+        self.rebuilds += 1
+
+    def _set(self, key: str, score: float):
+        old = self.scores.get(key)
+        if old is not None:
+            position = bisect_left(self._leaders, (-old, key))
+            if position < len(self._leaders) and self._leaders[position] == (-old, key):
+                del self._leaders[position]
+        if score > 0:
+            self.scores[key] = score
+        else:
+            self.scores.pop(key, None)
+            score = 0.0
+
+        # Below the bound it may rank under a community outside the list: leave
+        # it out, so the list stays an exact (if shorter) prefix of the ranking
+        if score > 0 and score >= self._bound:
+            insort(self._leaders, (-score, key))
+            if len(self._leaders) > self.depth:
+                popped, _ = self._leaders.pop()
+                self._bound = max(self._bound, -popped)
+        if len(self._leaders) < self.capacity and self._bound > 0:
+            self._rebuild()
+
+    def record(self, deltas: dict, now: float = None):
+        """Add net joins (community id -> delta) observed at `now`"""
+        now = self.clock() if now is None else now
+        if now - self.origin > REBASE_HALF_LIVES * self.half_life:
+            self._rebase(now)
+        weight = self._weight(now)
+        for key, delta in deltas.items():
+            if delta:
+                self._set(key, self.scores.get(key, 0.0) + delta * weight)
+        self._dirty = True
+
+    def top(self, k: int, now: float = None) -> list:
+        """The k highest scoring communities as (id, current score), best first"""
+        scale = 1 / self._weight(self.clock() if now is None else now)
+        return [(key, -score * scale) for score, key in self._leaders[:k]]
+
+    def top_ids(self, k: int) -> list:
+        return [key for _, key in self._leaders[:k]]
+
+    async def load(self):
+        """Start from the last snapshot, decayed to now"""
+        snapshot = await self.collection.find_one({"_id": "trending"})
+        if not snapshot:
+            return 0
+        at = snapshot["at"].replace(tzinfo=snapshot["at"].tzinfo or timezone.utc).timestamp()
+        factor = self._weight(at)
+        self.record({})  # rebase first if the board has been up for long
+        for key, score in snapshot["scores"]:
+            self.scores[key] = self.scores.get(key, 0.0) + score * factor
+        self._rebuild()
+        return len(snapshot["scores"])
+
+    async def save(self):
+        """Write the snapshot_size best scores, as of now, if anything changed"""
+        if not self._dirty:
+            return
+        self._dirty = False
+        now = self.clock()
+        scale = 1 / self._weight(now)
+        best = heapq.nlargest(self.snapshot_size, self.scores.items(), key=lambda item: item[1])
+        try:
+            await self.collection.replace_one(
+                {"_id": "trending"},
+                {"at": datetime.fromtimestamp(now, timezone.utc), "half_life": self.half_life,
+                 "scores": [[key, score * scale] for key, score in best]},
+                upsert=True
+            )
+        except Exception:
+            self._dirty = True
+            raise
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            try:
+                await self.save()
+            except Exception:
+                logger.exception("Trending snapshot failed, will retry")
+
+    def start(self):
+        if self._task is None and self.collection is not None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self.collection is not None:
+            try:
+                await self.save()
+            except Exception:
+                logger.exception("Final trending snapshot failed")
+
+    def samples(self):
+        yield "biddge_trending_communities", "gauge", (), len(self.scores)
+        yield "biddge_trending_rebuilds_total", "counter", (), self.rebuilds
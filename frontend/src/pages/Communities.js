@@ -38,7 +38,7 @@ export default function Communities() {
       
       console.log('🔍 Checking backend status...');
       
-      await axios.get(`${API}/test`, { 
+      await axios.get(`${API}/healthz`, { 
         timeout: 3000,
         validateStatus: (status) => status < 500
       });
@@ -62,7 +62,7 @@ export default function Communities() {
       
       console.log('⏰ Waking up backend...');
       
-      await axios.get(`${API}/test`, { 
+      await axios.get(`${API}/healthz`, { 
         timeout: 15000
       });
       
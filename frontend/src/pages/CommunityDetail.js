@@ -1,4 +1,4 @@
-import { useEffect, useState } from 'react';
+import { useEffect, useRef, useState } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import axios from 'axios';
 import { Navigation } from '../components/Navigation';
@@ -17,6 +17,7 @@ export default function CommunityDetail() {
   const [joinedCommunities, setJoinedCommunities] = useState([]);
   const [actionLoading, setActionLoading] = useState(false);
   const token = localStorage.getItem('token');
+  const live = useRef(false);
 
   useEffect(() => {
     fetchCommunity();
@@ -25,6 +26,33 @@ export default function CommunityDetail() {
     }
   }, [id, token]);
 
+  useEffect(() => {
+    // member_count deltas pushed by the server. EventSource reconnects by
+    // itself; refetch on reconnect to catch up on anything missed meanwhile.
+    const source = new EventSource(`${API}/communities/live?ids=${encodeURIComponent(id)}`);
+    source.onopen = () => {
+      if (live.current === null) {
+        fetchCommunity();
+      }
+      live.current = true;
+    };
+    source.onerror = () => {
+      if (live.current) {
+        live.current = null;
+      }
+    };
+    source.addEventListener('counts', (event) => {
+      const delta = JSON.parse(event.data)[id];
+      if (delta) {
+        setCommunity((current) => current && { ...current, member_count: current.member_count + delta });
+      }
+    });
+    return () => {
+      source.close();
+      live.current = false;
+    };
+  }, [id]);
+
   const fetchCommunity = async () => {
     try {
       const response = await axios.get(`${API}/communities/${id}`);
@@ -65,7 +93,9 @@ export default function CommunityDetail() {
       );
       toast.success('Successfully joined the community!');
       setJoinedCommunities([...joinedCommunities, id]);
-      setCommunity({ ...community, member_count: community.member_count + 1 });
+      if (!live.current) {
+        setCommunity({ ...community, member_count: community.member_count + 1 });
+      }
     } catch (error) {
       toast.error(error.response?.data?.detail || 'Failed to join community');
     } finally {
@@ -83,7 +113,9 @@ export default function CommunityDetail() {
       );
       toast.success('Successfully left the community');
       setJoinedCommunities(joinedCommunities.filter((cid) => cid !== id));
-      setCommunity({ ...community, member_count: community.member_count - 1 });
+      if (!live.current) {
+        setCommunity({ ...community, member_count: community.member_count - 1 });
+      }
     } catch (error) {
       toast.error(error.response?.data?.detail || 'Failed to leave community');
     } finally {
@@ -1,11 +1,11 @@
-import { useState } from 'react';
+import { useEffect, useState } from 'react';
 import axios from 'axios';
 import { Navigation } from '../components/Navigation';
 import { Button } from '../components/ui/button';
 import { Input } from '../components/ui/input';
 import { Label } from '../components/ui/label';
 import { Textarea } from '../components/ui/textarea';
-import { PlusCircle } from 'lucide-react';
+import { PlusCircle, TrendingUp } from 'lucide-react';
 import { toast } from 'sonner';
 import { useNavigate } from 'react-router-dom';
 
@@ -44,6 +44,21 @@ export default function CreatorDashboard() {
     category: '',
     image_url: ''
   });
+  const [stats, setStats] = useState(null);
+
+  useEffect(() => {
+    const fetchStats = async () => {
+      try {
+        const response = await axios.get(`${API}/creators/me/stats?days=30`, {
+          headers: { Authorization: `Bearer ${localStorage.getItem('token')}` }
+        });
+        setStats(response.data);
+      } catch (error) {
+        console.error('Error fetching creator stats:', error);
+      }
+    };
+    fetchStats();
+  }, []);
 
   const handleSubmit = async (e) => {
     e.preventDefault();
@@ -87,6 +102,39 @@ export default function CreatorDashboard() {
             </p>
           </div>
 
+          {stats && stats.totals.communities > 0 && (
+            <div className="bg-zinc-900 border border-zinc-800 rounded-2xl p-8 mb-8" data-testid="creator-stats">
+              <div className="flex items-center gap-3 mb-6">
+                <TrendingUp className="text-blue-400" size={32} />
+                <h2 className="text-2xl font-semibold">Last 30 Days</h2>
+              </div>
+              <div className="grid grid-cols-3 gap-4 mb-6">
+                <div>
+                  <div className="text-3xl font-bold">{stats.totals.members}</div>
+                  <div className="text-sm text-zinc-400">Members</div>
+                </div>
+                <div>
+                  <div className="text-3xl font-bold">{stats.totals.joins}</div>
+                  <div className="text-sm text-zinc-400">Joins</div>
+                </div>
+                <div>
+                  <div className="text-3xl font-bold">{stats.totals.net >= 0 ? '+' : ''}{stats.totals.net}</div>
+                  <div className="text-sm text-zinc-400">Net growth</div>
+                </div>
+              </div>
+              <div className="space-y-2">
+                {stats.communities.map((community) => (
+                  <div key={community.id} className="flex justify-between text-sm">
+                    <span className="text-zinc-300">{community.name}</span>
+                    <span className="text-zinc-400">
+                      {community.member_count} members ({community.net >= 0 ? '+' : ''}{community.net})
+                    </span>
+                  </div>
+                ))}
+              </div>
+            </div>
+          )}
+
           <div className="bg-zinc-900 border border-zinc-800 rounded-2xl p-8">
             <div className="flex items-center gap-3 mb-6">
               <PlusCircle className="text-blue-400" size={32} />